@@ -0,0 +1,68 @@
+import numpy as np
+from typing import Dict, List, Tuple
+
+# One week of mainnet slots (12s slots)
+DEFAULT_ARRIVAL_HISTORY_SLOTS = 7 * 7200
+
+class ArrivalTimeHistory:
+    """Fixed-size ring buffer of (slot, arrival_ms) pairs backed by NumPy arrays"""
+
+    def __init__(self, capacity: int = DEFAULT_ARRIVAL_HISTORY_SLOTS):
+        self.capacity = capacity
+        self._slots = np.zeros(capacity, dtype=np.int64)
+        self._arrival_ms = np.zeros(capacity, dtype=np.int32)
+        self._next = 0
+        self._size = 0
+        self.last_slot = -1
+
+    def __len__(self) -> int:
+        return self._size
+
+    def record(self, slot: int, arrival_ms: int) -> bool:
+        """Store the first arrival seen for a slot, ignoring repeats and reorgs to older slots"""
+        if slot <= self.last_slot:
+            return False
+
+        self._slots[self._next] = slot
+        self._arrival_ms[self._next] = arrival_ms
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        self.last_slot = slot
+        return True
+
+    def get_arrays(self, limit: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the newest `limit` entries (all if 0) as (slots, arrival_ms), oldest first"""
+        count = self._size if limit <= 0 else min(limit, self._size)
+        start = (self._next - count) % self.capacity
+        indexes = (start + np.arange(count)) % self.capacity
+        return self._slots[indexes], self._arrival_ms[indexes]
+
+    def get_latest(self, limit: int) -> List[Dict]:
+        """Get the newest arrival times in seconds, oldest first"""
+        slots, arrival_ms = self.get_arrays(limit)
+        return [
+            {'slot': int(slot), 'arrival_time': float(ms) / 1000}
+            for slot, ms in zip(slots, arrival_ms)
+        ]
+
+    def get_stats(self, window: int, late_threshold: float) -> Dict:
+        """Percentiles and late-block rate (in seconds) over the newest `window` entries"""
+        slots, arrival_ms = self.get_arrays(window)
+        if not len(arrival_ms):
+            return {'count': 0}
+
+        seconds = arrival_ms.astype(np.float64) / 1000
+        p50, p90, p99 = np.percentile(seconds, [50, 90, 99])
+        late_count = int(np.count_nonzero(seconds > late_threshold))
+        return {
+            'count': int(len(seconds)),
+            'from_slot': int(slots[0]),
+            'to_slot': int(slots[-1]),
+            'mean': round(float(seconds.mean()), 3),
+            'p50': round(float(p50), 3),
+            'p90': round(float(p90), 3),
+            'p99': round(float(p99), 3),
+            'late_threshold': late_threshold,
+            'late_count': late_count,
+            'late_rate': round(late_count / len(seconds), 4)
+        }
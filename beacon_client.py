@@ -4,22 +4,127 @@ from typing import List, Dict, Callable, Any, Optional
 import time
 import json
 from datetime import datetime
-from collections import deque
 import logging
 import httpx
+from arrival_history import ArrivalTimeHistory
+from slot_store import SlotStore
+from execution_metrics import ExecutionMetricsWindow
+
+# Pending events per listener before the oldest one is dropped
+LISTENER_QUEUE_SIZE = 4
+# Validators per attester duties request
+ATTESTER_DUTIES_CHUNK_SIZE = 1000
+# Delay after an epoch boundary before fetching the next duties
+DUTIES_REFRESH_DELAY_SECONDS = 1
+# Seconds into a slot a block is assumed to have arrived by before any arrival times are recorded
+DEFAULT_EXPECTED_ARRIVAL_OFFSET = 4.0
+# Recent slots used to estimate when blocks typically arrive
+EXPECTED_ARRIVAL_WINDOW = 300
+
+class ListenerDispatcher:
+    """Runs one event listener from a bounded queue in its own task.
+
+    Keeps a slow listener (e.g. a Divoom push) from stalling the event source.
+    When the queue is full the oldest pending event is dropped.
+    """
+
+    def __init__(self, event_type: str, callback: Callable[[Dict], Any], max_queue_size: int = LISTENER_QUEUE_SIZE,
+                 clock: Callable[[], float] = time.time):
+        self.event_type = event_type
+        self.callback = callback
+        self.clock = clock
+        self.name = getattr(callback, '__name__', repr(callback))
+        self.max_queue_size = max_queue_size
+        self.queue: Optional[asyncio.Queue] = None
+        self.task: Optional[asyncio.Task] = None
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self.last_queue_latency = 0.0
+        self.max_queue_latency = 0.0
+        self.last_handler_duration = 0.0
+        self.total_handler_duration = 0.0
+
+    def start(self):
+        """Start the worker task (requires a running event loop)"""
+        if self.task is None:
+            self.queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Cancel the worker task and discard pending events"""
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+            self.queue = None
+
+    def submit(self, data: Dict, received_at: float):
+        """Queue an event without blocking, dropping the oldest one if full"""
+        if self.task is None:
+            self.start()
+        if self.queue.full():
+            try:
+                self.queue.get_nowait()
+                self.dropped += 1
+            except asyncio.QueueEmpty:
+                pass
+        self.queue.put_nowait((received_at, data))
+
+    async def _run(self):
+        while True:
+            received_at, data = await self.queue.get()
+            started = self.clock()
+            queue_latency = started - received_at
+            self.last_queue_latency = queue_latency
+            self.max_queue_latency = max(self.max_queue_latency, queue_latency)
+            try:
+                await self.callback(data)
+                self.delivered += 1
+            except Exception as e:
+                self.errors += 1
+                print(f"Error in {self.event_type} listener {self.name}: {e}")
+            duration = self.clock() - started
+            self.last_handler_duration = duration
+            self.total_handler_duration += duration
+
+    def get_metrics(self) -> Dict:
+        handled = self.delivered + self.errors
+        return {
+            'event_type': self.event_type,
+            'listener': self.name,
+            'pending': self.queue.qsize() if self.queue else 0,
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'last_queue_latency': round(self.last_queue_latency, 4),
+            'max_queue_latency': round(self.max_queue_latency, 4),
+            'last_handler_duration': round(self.last_handler_duration, 4),
+            'avg_handler_duration': round(self.total_handler_duration / handled, 4) if handled else 0.0
+        }
 
 class BeaconClient:
-    def __init__(self, node_url: str, validator_indexes: List[str]):
+    def __init__(self, node_url: str, validator_indexes: List[str], store: Optional[SlotStore] = None):
         self.node_url = node_url
         self.validator_indexes = validator_indexes
+        self.store = store
         self.config = None
         self.genesis = None
-        self._event_listeners: Dict[str, List[Callable]] = {
+        self._event_listeners: Dict[str, List[ListenerDispatcher]] = {
             'head': [],
             'slot': []
         }
-        # Changed from 12 to 16 slots
-        self.block_arrival_times = deque(maxlen=16)
+        self.arrival_history = ArrivalTimeHistory()
+        self.execution_window = ExecutionMetricsWindow()
+        self.head_slot = -1  # Newest slot seen in a head event
+        self._expected_arrival: Optional[tuple] = None  # (last_slot, percentile, offset)
+        # Wall clock anchor for monotonic timestamps, so arrival times are
+        # not skewed by NTP adjustments between slot start and block arrival
+        self._wall_anchor = time.time()
+        self._monotonic_anchor = time.monotonic()
         # Cache duties by epoch
         self.duties_cache = {
             'proposer': {},  # epoch -> dict of slot -> validator_index
@@ -31,6 +136,10 @@ class BeaconClient:
             'proposer': [],
             'attester': []
         }
+        # (duty_type, epoch) -> dependent_root the cached duties were computed from
+        self._duty_dependent_roots: Dict[tuple, str] = {}
+        self._stale_duty_epochs = set()
+        self._duties_refresh_event: Optional[asyncio.Event] = None
         # Update block cache type hint and structure
         self.block_cache: Dict[int, Dict] = {}  # slot -> block data
         self.rewards_cache = {}  # epoch -> rewards data
@@ -43,9 +152,13 @@ class BeaconClient:
         self.config = await self._fetch_config()
         self.genesis = await self._fetch_genesis()
         print(f"Slots per epoch: {self.config['data']['SLOTS_PER_EPOCH']}")
+
+        # Restore state saved before the last shutdown
+        if self.store:
+            self._load_from_store()
         
-        # Prewarm the block cache
-        self._prewarm_block_cache()
+        # Prewarm the block cache with the slots not restored from the store
+        asyncio.create_task(self._prewarm_block_cache())
 
     async def _fetch_config(self):
         async with self.session.get(f"{self.node_url}/eth/v1/config/spec") as response:
@@ -59,6 +172,61 @@ class BeaconClient:
                 raise Exception(f"Failed to fetch genesis: {await response.text()}")
             return await response.json()
 
+    def get_store_retention(self):
+        """Oldest (slot, rewards epoch, duties epoch) worth keeping in the store"""
+        slots_per_epoch = int(self.config['data']['SLOTS_PER_EPOCH'])
+        current_slot = self.calculate_current_slot()
+        current_epoch = current_slot // slots_per_epoch
+        return (
+            current_slot - self.arrival_history.capacity,
+            current_epoch - self.max_cached_epochs,
+            current_epoch
+        )
+
+    def _load_from_store(self):
+        """Populate caches from the slot store so only the gap since shutdown is fetched"""
+        min_slot, min_rewards_epoch, min_duties_epoch = self.get_store_retention()
+        try:
+            self.store.prune(min_slot, min_rewards_epoch, min_duties_epoch)
+
+            for slot, arrival_ms in self.store.load_arrivals(min_slot):
+                self.arrival_history.record(slot, arrival_ms)
+
+            current_slot = self.calculate_current_slot()
+            slots_per_epoch = int(self.config['data']['SLOTS_PER_EPOCH'])
+            cache_from = current_slot - slots_per_epoch * 5
+            window_from = current_slot - self.execution_window.capacity
+            finalized_before = self._finalized_before_slot(current_slot)
+            for slot, entry in self.store.load_slots(min(cache_from, window_from)).items():
+                if entry['summary']:
+                    self.execution_window.record(slot, entry['summary'])
+                # Recent "missing" entries are fetched again rather than trusted
+                if slot >= cache_from and (entry['status'] != 'missing' or slot < finalized_before):
+                    self.block_cache[slot] = entry
+
+            # Rewards and attester duties depend on the validator set, so only
+            # restore epochs that were fetched for the same validators
+            self.rewards_cache.update(self.store.load_rewards(min_rewards_epoch, self.validator_indexes))
+            attester = self.store.load_duties(min_duties_epoch, 'attester', self.validator_indexes)
+            proposer = self.store.load_duties(min_duties_epoch, 'proposer', [])
+            for epoch, slots in attester.items():
+                if epoch in proposer:
+                    self.duties_cache['attester'][epoch] = set(slots)
+                    self.duties_cache['proposer'][epoch] = {
+                        int(slot): index for slot, index in proposer[epoch].items()
+                    }
+
+            logging.info(
+                f"Restored {len(self.arrival_history)} arrival times, {len(self.block_cache)} slots, "
+                f"{len(self.rewards_cache)} reward epochs and {len(self.duties_cache['proposer'])} duty epochs from store"
+            )
+        except Exception as e:
+            logging.error(f"Error restoring state from store: {e}")
+
+    def now(self) -> float:
+        """Current unix time derived from the monotonic clock"""
+        return self._wall_anchor + (time.monotonic() - self._monotonic_anchor)
+
     def calculate_current_slot(self) -> int:
         if not self.config or not self.genesis:
             raise Exception("BeaconClient not initialized. Call initialize() first")
@@ -92,59 +260,99 @@ class BeaconClient:
                 raise Exception(f"Failed to fetch checkpoints: {await response.text()}")
             return await response.json()
 
-    async def update_duties(self, validator_indexes: List[str]):
-        """Fetch and update proposer and attester duties"""
-        epoch_data = self.get_epoch_data()
-        current_epoch = epoch_data['current_epoch']
-        
-        # Check if we already have duties for current and next epoch
-        epochs_to_fetch = []
+    def _update_combined_duties(self):
+        """Rebuild the combined duties lists for current and next epoch from cache"""
+        current_epoch = self.get_epoch_data()['current_epoch']
+        duties = {
+            'proposer': [],
+            'attester': []
+        }
         for epoch in [current_epoch, current_epoch + 1]:
-            if epoch not in self.duties_cache['proposer']:
-                epochs_to_fetch.append(epoch)
-                logging.info(f"Need to fetch duties for epoch {epoch}")
-
-        if not epochs_to_fetch:
-            logging.debug(f"Using cached duties for epochs {current_epoch} and {current_epoch + 1}")
-            # Update combined duties from cache
-            self.duties = {
-                'proposer': [],
-                'attester': []
-            }
-            for epoch in [current_epoch, current_epoch + 1]:
-                if epoch in self.duties_cache['proposer']:
-                    self.duties['proposer'].extend(self.duties_cache['proposer'][epoch].keys())
-                if epoch in self.duties_cache['attester']:
-                    self.duties['attester'].extend(list(self.duties_cache['attester'][epoch]))
-            return
-
-        # Fetch duties for epochs we don't have
-        for epoch in epochs_to_fetch:
-            logging.info(f"Fetching duties for epoch {epoch}")
-            # Initialize cache for this epoch
-            self.duties_cache['proposer'][epoch] = {}
-            self.duties_cache['attester'][epoch] = set()
-
-            # Fetch proposer duties for the epoch
-            url = f"{self.node_url}/eth/v1/validator/duties/proposer/{epoch}"
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    duties = await response.json()
-                    logging.info(f"Got proposer duties response: {duties}")
-                    for duty in duties.get('data', []):
-                        slot = int(duty.get('slot'))
-                        validator_index = int(duty.get('validator_index'))
-                        self.duties_cache['proposer'][epoch][slot] = validator_index
-                        logging.info(f"Added proposer duty: epoch={epoch}, slot={slot}, validator={validator_index}")
-
-            # Fetch attester duties
-            url = f"{self.node_url}/eth/v1/validator/duties/attester/{epoch}"
-            headers = {'Content-Type': 'application/json'}
-            async with self.session.post(url, json=validator_indexes, headers=headers) as response:
-                if response.status == 200:
-                    duties = await response.json()
-                    for duty in duties.get('data', []):
-                        self.duties_cache['attester'][epoch].add(int(duty.get('slot')))
+            if epoch in self.duties_cache['proposer']:
+                duties['proposer'].extend(self.duties_cache['proposer'][epoch].keys())
+            if epoch in self.duties_cache['attester']:
+                duties['attester'].extend(list(self.duties_cache['attester'][epoch]))
+        self.duties = duties
+
+    async def _fetch_proposer_duties(self, epoch: int):
+        """Fetch proposer duties as (slot -> validator_index, dependent_root)"""
+        url = f"{self.node_url}/eth/v1/validator/duties/proposer/{epoch}"
+        async with self.session.get(url) as response:
+            if response.status != 200:
+                raise Exception(f"Failed to fetch proposer duties for epoch {epoch}: {response.status}")
+            duties = await response.json()
+        proposers = {
+            int(duty.get('slot')): int(duty.get('validator_index'))
+            for duty in duties.get('data', [])
+        }
+        return proposers, duties.get('dependent_root')
+
+    async def _fetch_attester_duties(self, epoch: int, validator_indexes: List[str]):
+        """Fetch attester duty slots as (slots, dependent_root), chunking large validator sets"""
+        url = f"{self.node_url}/eth/v1/validator/duties/attester/{epoch}"
+        headers = {'Content-Type': 'application/json'}
+
+        async def fetch_chunk(chunk: List[str]):
+            async with self.session.post(url, json=chunk, headers=headers) as response:
+                if response.status != 200:
+                    raise Exception(f"Failed to fetch attester duties for epoch {epoch}: {response.status}")
+                return await response.json()
+
+        chunks = [
+            validator_indexes[i:i + ATTESTER_DUTIES_CHUNK_SIZE]
+            for i in range(0, len(validator_indexes), ATTESTER_DUTIES_CHUNK_SIZE)
+        ]
+        responses = await asyncio.gather(*[fetch_chunk(chunk) for chunk in chunks])
+
+        slots = set()
+        for duties in responses:
+            for duty in duties.get('data', []):
+                slots.add(int(duty.get('slot')))
+        dependent_root = responses[0].get('dependent_root') if responses else None
+        return slots, dependent_root
+
+    async def update_duties(self, validator_indexes: List[str], stale_epochs: Optional[set] = None) -> bool:
+        """Fetch proposer and attester duties for current and next epoch in parallel.
+
+        Only epochs missing from the cache (or listed in `stale_epochs`) are
+        fetched. Cached duties stay in place until their replacement arrives.
+        Returns True if every needed epoch was fetched successfully.
+        """
+        current_epoch = self.get_epoch_data()['current_epoch']
+        stale_epochs = stale_epochs or set()
+        epochs_to_fetch = [
+            epoch for epoch in [current_epoch, current_epoch + 1]
+            if epoch not in self.duties_cache['proposer'] or epoch in stale_epochs
+        ]
+
+        success = True
+        if epochs_to_fetch:
+            logging.info(f"Fetching duties for epochs {epochs_to_fetch}")
+            results = await asyncio.gather(
+                *[self._fetch_proposer_duties(epoch) for epoch in epochs_to_fetch],
+                *[self._fetch_attester_duties(epoch, validator_indexes) for epoch in epochs_to_fetch],
+                return_exceptions=True
+            )
+            proposer_results = results[:len(epochs_to_fetch)]
+            attester_results = results[len(epochs_to_fetch):]
+
+            for epoch, proposer, attester in zip(epochs_to_fetch, proposer_results, attester_results):
+                if isinstance(proposer, Exception) or isinstance(attester, Exception):
+                    logging.error(f"Error fetching duties for epoch {epoch}: {proposer if isinstance(proposer, Exception) else attester}")
+                    success = False
+                    continue
+
+                proposers, proposer_root = proposer
+                attester_slots, attester_root = attester
+                self.duties_cache['proposer'][epoch] = proposers
+                self.duties_cache['attester'][epoch] = attester_slots
+                self._duty_dependent_roots[('proposer', epoch)] = proposer_root
+                self._duty_dependent_roots[('attester', epoch)] = attester_root
+                logging.debug(f"Duties for epoch {epoch}: proposers={proposers}, attester_slots={sorted(attester_slots)}")
+
+                if self.store:
+                    self.store.save_duties(epoch, 'proposer', [], proposers)
+                    self.store.save_duties(epoch, 'attester', validator_indexes, sorted(attester_slots))
 
         # Clean up old epochs
         for duty_type in ['proposer', 'attester']:
@@ -153,8 +361,67 @@ class BeaconClient:
                 for epoch, slots in self.duties_cache[duty_type].items() 
                 if epoch >= current_epoch
             }
+        self._duty_dependent_roots = {
+            key: root for key, root in self._duty_dependent_roots.items() if key[1] >= current_epoch
+        }
 
-        logging.info(f"Duties cache after update: {self.duties_cache['proposer']}")
+        self._update_combined_duties()
+        return success
+
+    def _check_duty_dependent_roots(self, slot: int, event: Dict):
+        """Schedule a duties refresh if a head event shows a dependent root changed (reorg)"""
+        slots_per_epoch = int(self.config['data']['SLOTS_PER_EPOCH'])
+        epoch = slot // slots_per_epoch
+        expected = {
+            ('proposer', epoch): event.get('current_duty_dependent_root'),
+            ('attester', epoch): event.get('previous_duty_dependent_root'),
+            ('attester', epoch + 1): event.get('current_duty_dependent_root'),
+        }
+        for key, root in expected.items():
+            known = self._duty_dependent_roots.get(key)
+            if root and known and root != known:
+                logging.info(f"Dependent root changed for {key[0]} duties of epoch {key[1]}, refreshing")
+                self._stale_duty_epochs.add(key[1])
+        if self._stale_duty_epochs and self._duties_refresh_event:
+            self._duties_refresh_event.set()
+
+    async def run_duties_scheduler(self):
+        """Keep duties for current and next epoch fresh in the background.
+
+        Refreshes just after each epoch boundary, when a head event reports a
+        changed dependent root, and retries every slot after a failed fetch.
+        """
+        self._duties_refresh_event = asyncio.Event()
+        slots_per_epoch = int(self.config['data']['SLOTS_PER_EPOCH'])
+        seconds_per_slot = int(self.config['data']['SECONDS_PER_SLOT'])
+
+        # Duties restored from the store have no known dependent root, revalidate them once
+        self._stale_duty_epochs.update(
+            epoch for epoch in self.duties_cache['proposer']
+            if ('proposer', epoch) not in self._duty_dependent_roots
+        )
+
+        while True:
+            try:
+                stale_epochs, self._stale_duty_epochs = self._stale_duty_epochs, set()
+                success = await self.update_duties(self.validator_indexes, stale_epochs)
+
+                if success:
+                    epoch_data = self.get_epoch_data()
+                    next_epoch_start = self.get_slot_start_time(epoch_data['current_epoch_start_slot'] + slots_per_epoch)
+                    wait_time = next_epoch_start + DUTIES_REFRESH_DELAY_SECONDS - self.now()
+                else:
+                    self._stale_duty_epochs.update(stale_epochs)
+                    wait_time = seconds_per_slot
+
+                try:
+                    await asyncio.wait_for(self._duties_refresh_event.wait(), timeout=max(wait_time, 0))
+                except asyncio.TimeoutError:
+                    pass
+                self._duties_refresh_event.clear()
+            except Exception as e:
+                logging.error(f"Error in duties scheduler: {e}")
+                await asyncio.sleep(seconds_per_slot)
 
     async def get_block(self, slot: int) -> Optional[Dict]:
         """Get block data for a slot, using cache if available"""
@@ -166,14 +433,9 @@ class BeaconClient:
             async with self.session.get(f"{self.node_url}/eth/v2/beacon/blocks/{slot}") as response:
                 if response.status == 200:
                     block_data = await response.json()
-                    self.block_cache[slot] = {
-                        "status": "proposed",
-                        "data": block_data["data"]
-                    }
-                    return self.block_cache[slot]
+                    return self._cache_block(slot, block_data["data"])
                 elif response.status == 404:
-                    self.block_cache[slot] = {"status": "missing"}
-                    return self.block_cache[slot]
+                    return self._cache_missing(slot)
                 else:
                     logging.error(f"Unexpected status {response.status} fetching block {slot}")
                     return None
@@ -181,6 +443,52 @@ class BeaconClient:
             logging.error(f"Error fetching block {slot}: {e}")
             return None
 
+    def _summarize_block(self, block_data: Dict) -> Dict:
+        """Extract the compact per-slot fields worth keeping across restarts"""
+        message = block_data["message"]
+        summary = {"proposer_index": int(message["proposer_index"])}
+        execution_payload = message["body"].get("execution_payload")
+        if execution_payload:
+            summary.update({
+                "block_number": int(execution_payload["block_number"]),
+                "base_fee_per_gas": int(execution_payload["base_fee_per_gas"]),
+                "gas_used": int(execution_payload["gas_used"]),
+                "gas_limit": int(execution_payload["gas_limit"]),
+                "tx_count": len(execution_payload["transactions"]),
+                "extra_data": execution_payload["extra_data"]
+            })
+        return summary
+
+    def _cache_block(self, slot: int, block_data: Dict) -> Dict:
+        """Cache a proposed block's summary, feed the execution window and persist it"""
+        summary = self._summarize_block(block_data)
+        self.block_cache[slot] = {"status": "proposed", "summary": summary}
+        self.execution_window.record(slot, summary)
+        if self.store:
+            self.store.save_slot(slot, "proposed", summary)
+        return self.block_cache[slot]
+
+    def _cache_missing(self, slot: int) -> Dict:
+        """Cache and persist a slot without a block.
+
+        A 404 for the current slot or one at or after the head only means the
+        block has not arrived yet, so it is returned without being cached.
+        """
+        settled_before = self.calculate_current_slot()
+        if self.head_slot >= 0:
+            settled_before = min(settled_before, self.head_slot)
+        if slot >= settled_before:
+            return {"status": "missing"}
+        self.block_cache[slot] = {"status": "missing"}
+        # Only persist once the slot is final; until then a late block or reorg can still fill it
+        if self.store and slot < self._finalized_before_slot(settled_before):
+            self.store.save_slot(slot, "missing")
+        return self.block_cache[slot]
+
+    def _finalized_before_slot(self, head_slot: int) -> int:
+        """Slots before this one are normally finalized (two epochs behind the head)"""
+        return head_slot - 2 * int(self.config['data']['SLOTS_PER_EPOCH'])
+
     async def get_slots(self, validator_indexes: List[str]):
         """Get slots from last 5 epochs and next epoch"""
         epoch_data = self.get_epoch_data()
@@ -208,7 +516,7 @@ class BeaconClient:
                 continue
                 
             block = await self.get_block(slot)
-            if block:
+            if block and block["status"] == "proposed":
                 slots.append({
                     "slot": slot,
                     "status": "proposed"
@@ -219,8 +527,8 @@ class BeaconClient:
                     "status": "missing"
                 })
         
-        # Update duties before returning slots
-        await self.update_duties(validator_indexes)
+        # Duties are kept fresh by run_duties_scheduler, just read the cache
+        self._update_combined_duties()
         
         # Convert duties to a format that can be JSON serialized
         duties_json = {
@@ -281,6 +589,8 @@ class BeaconClient:
                     headers={'Accept': 'text/event-stream'}
                 ) as response:
                     async for line in response.content:
+                        # Timestamp as soon as the line comes off the socket
+                        received_at = self.now()
                         if line:
                             try:
                                 decoded = line.decode('utf-8').strip()
@@ -288,55 +598,88 @@ class BeaconClient:
                                     continue
                                 if decoded.startswith('data:'):
                                     data = json.loads(decoded[5:])
-                                    now = time.time()
                                     slot = int(data.get('slot', 0))
 
                                     logging.info(f"Head event - Slot: {slot}")
+                                    self._check_duty_dependent_roots(slot, data)
                                     
                                     # Calculate arrival time (seconds since slot start)
                                     slot_start = self.get_slot_start_time(slot)
-                                    arrival_time = now - slot_start
-
-                                    # Fetch the block and throw in cache
-                                    self.get_block(slot)
+                                    arrival_time = received_at - slot_start
+
+                                    # Fetch the block and throw in cache, which also
+                                    # updates the execution metrics window. A "missing"
+                                    # entry from polling before the block existed is stale
+                                    self.head_slot = max(self.head_slot, slot)
+                                    if self.block_cache.get(slot, {}).get("status") == "missing":
+                                        del self.block_cache[slot]
+                                    asyncio.create_task(self.get_block(slot))
                                     
                                     # Store arrival time
-                                    self.block_arrival_times.append({
-                                        'slot': slot,
-                                        'arrival_time': arrival_time
-                                    })
+                                    arrival_ms = int(arrival_time * 1000)
+                                    if self.arrival_history.record(slot, arrival_ms) and self.store:
+                                        self.store.save_arrival(slot, arrival_ms)
                                     
                                     print(f"[{datetime.now().strftime('%H:%M:%S')}] Head event - Slot: {slot}, "
                                           f"Block: {data.get('block')[:8]}..., Arrival: {arrival_time:.2f}s")
                                     
-                                    await self._notify_listeners('head', {
+                                    self._notify_listeners('head', {
                                         **data,
                                         'arrival_time': arrival_time
-                                    })
+                                    }, received_at)
                             except Exception as e:
                                 print(f"Error processing event: {e}")
             except Exception as e:
                 print(f"SSE connection error: {e}")
                 await asyncio.sleep(5)  # Wait before reconnecting
 
-    async def get_arrival_times(self):
-        """Get the last 32 block arrival times"""
+    async def get_arrival_times(self, limit: int = 16, window: int = 7200, late_threshold: float = 4.0):
+        """Get the last `limit` block arrival times and stats over the last `window` slots"""
         return {
-            'arrival_times': list(self.block_arrival_times),
+            'arrival_times': self.arrival_history.get_latest(limit),
+            'stats': self.arrival_history.get_stats(window, late_threshold),
             'seconds_per_slot': int(self.config['data']['SECONDS_PER_SLOT'])
         }
 
+    def get_expected_arrival_offset(self, percentile: str = 'p90') -> float:
+        """Seconds into a slot by which blocks have typically arrived, from recent arrival times"""
+        last_slot = self.arrival_history.last_slot
+        cached = self._expected_arrival
+        if cached and cached[0] == last_slot and cached[1] == percentile:
+            return cached[2]
+
+        stats = self.arrival_history.get_stats(EXPECTED_ARRIVAL_WINDOW, DEFAULT_EXPECTED_ARRIVAL_OFFSET)
+        offset = stats.get(percentile, DEFAULT_EXPECTED_ARRIVAL_OFFSET)
+        self._expected_arrival = (last_slot, percentile, offset)
+        return offset
+
     def add_head_listener(self, callback: Callable[[Dict], Any]):
         """Add a listener for head events"""
-        self._event_listeners['head'].append(callback)
-
-    async def _notify_listeners(self, event_type: str, data: Dict):
-        """Notify all listeners of a specific event type"""
-        for listener in self._event_listeners.get(event_type, []):
-            try:
-                await listener(data)
-            except Exception as e:
-                print(f"Error in event listener: {e}")
+        self._event_listeners['head'].append(ListenerDispatcher('head', callback, clock=self.now))
+
+    def _notify_listeners(self, event_type: str, data: Dict, received_at: Optional[float] = None):
+        """Queue an event for every listener of a type without waiting on them"""
+        if received_at is None:
+            received_at = self.now()
+        for dispatcher in self._event_listeners.get(event_type, []):
+            dispatcher.submit({**data, 'received_at': received_at}, received_at)
+
+    def get_listener_metrics(self) -> List[Dict]:
+        """Get queue and latency metrics for every registered listener"""
+        return [
+            dispatcher.get_metrics()
+            for dispatchers in self._event_listeners.values()
+            for dispatcher in dispatchers
+        ]
+
+    async def close(self):
+        """Stop listener tasks and close the HTTP session"""
+        for dispatchers in self._event_listeners.values():
+            for dispatcher in dispatchers:
+                await dispatcher.stop()
+        if self.session:
+            await self.session.close()
+            self.session = None
 
     def get_next_slot_time(self) -> float:
         """Calculate the timestamp of the next slot"""
@@ -366,7 +709,7 @@ class BeaconClient:
                     await asyncio.sleep(wait_time)
                 
                 # Notify slot listeners
-                await self._notify_listeners('slot', {
+                self._notify_listeners('slot', {
                     'slot': self.calculate_current_slot(),
                     'timestamp': time.time()
                 })
@@ -377,7 +720,7 @@ class BeaconClient:
 
     def add_slot_listener(self, callback: Callable[[Dict], Any]):
         """Add a listener for slot changes"""
-        self._event_listeners['slot'].append(callback)
+        self._event_listeners['slot'].append(ListenerDispatcher('slot', callback, clock=self.now))
 
     async def get_upcoming_proposers(self) -> List[Dict]:
         """Get proposers for current and next epoch"""
@@ -387,9 +730,7 @@ class BeaconClient:
             current_epoch = current_slot // slots_per_epoch
         
             
-            # Make sure we have duties for current and next epoch
-            await self.update_duties(self.validator_indexes)
-            
+            # Duties are kept fresh by run_duties_scheduler
             proposers = []
             epochs_to_check = [current_epoch, current_epoch + 1]
 
@@ -437,6 +778,8 @@ class BeaconClient:
                     
             # Cache results
             self.rewards_cache[epoch] = rewards
+            if self.store:
+                self.store.save_rewards(epoch, self.validator_indexes, rewards)
             
             # Cleanup old epochs
             if len(self.rewards_cache) > self.max_cached_epochs:
@@ -449,75 +792,28 @@ class BeaconClient:
             logging.error(f"Error fetching rewards for epoch {epoch}: {e}")
             return None
 
-    async def get_gas_metrics(self):
-        """Fetch gas metrics from recent blocks"""
+    async def get_gas_metrics(self, window: int = 15, points: int = 0):
+        """Get gas metrics for the latest block and the last `window` slots"""
         try:
-            async with httpx.AsyncClient() as client:
-                # Get latest block
-                response = await client.get(f"{self.node_url}/eth/v2/beacon/blocks/head")
-                response.raise_for_status()
-                latest_block = response.json()["data"]
-                current_slot = int(latest_block["message"]["slot"])
-                
-                # Get execution payload from latest block
-                execution_payload = latest_block["message"]["body"]["execution_payload"]
-                latest_base_fee = int(execution_payload["base_fee_per_gas"]) / 1e9
-                latest_gas_used = int(execution_payload["gas_used"])
-                latest_gas_limit = int(execution_payload["gas_limit"])
-                latest_tx_count = len(execution_payload["transactions"])
-                
-                # Try to decode extra data
-                try:
-                    extra_data = bytes.fromhex(execution_payload["extra_data"][2:]).decode('utf-8').strip()
-                except:
-                    extra_data = None
-                
-                # Get transaction count from last 15 blocks
-                total_tx_count = latest_tx_count
-                blocks_counted = 1
-                
-                for slot in range(current_slot - 14, current_slot):
-                    # Skip future slots
-                    if slot >= current_slot:
-                        continue
-                    
-                    # Check cache first
-                    cached = self.block_cache.get(slot)
-                    if cached and cached["status"] == "proposed" and "data" in cached:
-                        try:
-                            execution_payload = cached["data"]["message"]["body"]["execution_payload"]
-                            total_tx_count += len(execution_payload["transactions"])
-                            blocks_counted += 1
-                            continue
-                        except:
-                            pass
-                    
-                    # Fetch if not in cache or cache miss
-                    try:
-                        response = await client.get(f"{self.node_url}/eth/v2/beacon/blocks/{slot}")
-                        if response.status_code == 200:
-                            block_data = response.json()["data"]
-                            execution_payload = block_data["message"]["body"]["execution_payload"]
-                            total_tx_count += len(execution_payload["transactions"])
-                            blocks_counted += 1
-                            # Update cache with full block data
-                            self.block_cache[slot] = {"status": "proposed", "data": block_data}
-                    except:
-                        continue
-                
-                return {
-                    "latest": {
-                        "base_fee": round(latest_base_fee, 2),
-                        "gas_used": latest_gas_used,
-                        "gas_limit": latest_gas_limit,
-                        "utilization": round((latest_gas_used / latest_gas_limit) * 100, 1),
-                        "tx_count": latest_tx_count,
-                        "extra_data": extra_data if extra_data else None
-                    },
-                    "total_tx": total_tx_count,
-                    "blocks_counted": blocks_counted
-                }
-                
+            if self.execution_window.head_slot < 0:
+                # Nothing recorded yet (no head event since startup), seed from the head block
+                async with self.session.get(f"{self.node_url}/eth/v2/beacon/blocks/head") as response:
+                    response.raise_for_status()
+                    block_data = (await response.json())["data"]
+                    self._cache_block(int(block_data["message"]["slot"]), block_data)
+
+            latest = self.execution_window.get_latest()
+            if not latest:
+                return None
+
+            stats = self.execution_window.get_window_stats(window, points)
+            return {
+                "latest": latest,
+                "total_tx": stats["total_tx"],
+                "blocks_counted": stats["blocks_counted"],
+                "window": stats
+            }
+
         except Exception as e:
             logging.error(f"Error fetching gas metrics: {e}")
             return None
@@ -525,19 +821,17 @@ class BeaconClient:
     async def _prewarm_block_cache(self):
         """Fetch recent blocks to prewarm the cache"""
         try:
-            logging.info("Prewarming block cache...")
             slots_per_epoch = int(self.config['data']['SLOTS_PER_EPOCH'])
             current_slot = self.calculate_current_slot()
             start_slot = current_slot - (slots_per_epoch * 5)  # 5 epochs back
             
+            unknown_slots = [slot for slot in range(start_slot, current_slot + 1) if slot not in self.block_cache]
+            logging.info(f"Prewarming block cache with {len(unknown_slots)} slots not restored from the store...")
+            
             async with httpx.AsyncClient() as client:
                 cached_count = 0
-                for slot in range(start_slot, current_slot + 1, 2):
-                    tasks = [
-                        self._fetch_and_cache_block(client, slot),
-                        self._fetch_and_cache_block(client, slot + 1) if slot + 1 <= current_slot else None
-                    ]
-                    tasks = [t for t in tasks if t is not None]
+                for index in range(0, len(unknown_slots), 2):
+                    tasks = [self._fetch_and_cache_block(client, slot) for slot in unknown_slots[index:index + 2]]
                     
                     results = await asyncio.gather(*tasks, return_exceptions=True)
                     cached_count += sum(1 for r in results if r and not isinstance(r, Exception))
@@ -554,10 +848,10 @@ class BeaconClient:
             response = await client.get(f"{self.node_url}/eth/v2/beacon/blocks/{slot}")
             if response.status_code == 200:
                 block_data = response.json()["data"]
-                self.block_cache[slot] = {"status": "proposed", "data": block_data}
+                self._cache_block(slot, block_data)
                 return True
             elif response.status_code == 404:
-                self.block_cache[slot] = {"status": "missing"}
+                self._cache_missing(slot)
                 return False
         except Exception as e:
             logging.error(f"Error fetching block {slot}: {e}")
@@ -3,17 +3,36 @@ DeFiLlama API client for fetching Ethereum DeFi protocol data.
 
 This module provides an async client for accessing DeFiLlama's open API
 to retrieve TVL, yield, and volume data for Ethereum DeFi protocols.
+
+Data is organised as a small pipeline: each upstream document (a source)
+is downloaded once and every view derived from it (a filtered top-K
+list, see VIEWS) is computed in the same pass over its rows.
 """
 
 import httpx
 import asyncio
+import heapq
+import itertools
 import logging
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+import gzip
+import json
+import os
+import time
+import ijson
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Any, Tuple
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Bytes read from the response per parser step when streaming large documents
+STREAM_CHUNK_SIZE = 64 * 1024
+# Minimum wait before retrying a dataset whose last refresh failed
+REFRESH_RETRY_DELAY = timedelta(seconds=30)
+# Returned by fetchers when a conditional request got 304 Not Modified
+NOT_MODIFIED = object()
+
 
 @dataclass
 class ProtocolData:
@@ -45,57 +64,395 @@ class DexData:
     fees_24h: float
 
 
+class TopK:
+    """
+    Bounded min-heap keeping the K items with the largest ranking key.
+    
+    Items with equal keys keep their insertion order, like a stable sort.
+    """
+    
+    def __init__(self, k: int):
+        self.k = k
+        self._heap: List[Tuple[float, int, Any]] = []
+        self._counter = itertools.count()
+    
+    def push(self, key: float, item: Any) -> None:
+        entry = (key, -next(self._counter), item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+    
+    def items(self) -> List[Any]:
+        """Return the kept items, highest key first."""
+        return [item for _, _, item in sorted(self._heap, key=lambda e: e[:2], reverse=True)]
+
+
+class StreamingTopK:
+    """
+    Incremental JSON parser that ranks array items as bytes arrive.
+    
+    Each item is offered to every ranker in a single pass. Only one array
+    item is materialized at a time, so peak memory stays bounded by the
+    K of each ranker regardless of the document size.
+    
+    Args:
+        prefix: ijson prefix of the array items (e.g. "item" or "data.item")
+        rankers: Name -> (rank, k); rank returns (key, value) for items to
+            keep, None to skip them
+    """
+    
+    def __init__(self, prefix: str, rankers: Dict[str, Tuple[Callable[[Any], Optional[Tuple[float, Any]]], int]]):
+        self.rankers = [(name, rank, TopK(k)) for name, (rank, k) in rankers.items()]
+        self.items_seen = 0
+        self._events = ijson.sendable_list()
+        self._parser = ijson.items_coro(self._events, prefix, use_float=True)
+    
+    def feed(self, chunk: bytes) -> None:
+        """Parse a chunk of the document and rank any completed items."""
+        self._parser.send(chunk)
+        self._drain()
+    
+    def close(self) -> Dict[str, List[Any]]:
+        """Finish parsing and return each ranker's top K values, highest key first."""
+        self._parser.close()
+        self._drain()
+        return {name: top.items() for name, _, top in self.rankers}
+    
+    def _drain(self) -> None:
+        for item in self._events:
+            self.items_seen += 1
+            if not isinstance(item, dict):
+                continue
+            for _, rank, top in self.rankers:
+                ranked = rank(item)
+                if ranked is not None:
+                    top.push(*ranked)
+        del self._events[:]
+
+
+def _row_chains(row: Dict) -> List[str]:
+    """Lowercased chain names of a /protocols, /pools or /overview/dexs row."""
+    chains = row.get('chains')
+    if isinstance(chains, list):
+        return [c.lower() for c in chains if isinstance(c, str)]
+    chain = row.get('chain')
+    return [chain.lower()] if isinstance(chain, str) else []
+
+
+def _protocol_item(row: Dict, view: "ViewConfig") -> Optional[ProtocolData]:
+    """Build ProtocolData from a /protocols row, None if it has invalid data."""
+    tvl_val = row.get('tvl')
+    change_val = row.get('change_1d')
+    
+    # Skip protocols with invalid data
+    if tvl_val is None or change_val is None:
+        return None
+    
+    if view.chain_tvl:
+        # Only count TVL on the view's chains
+        chain_tvls = row.get('chainTvls') or {}
+        tvl_val = sum(
+            value for chain, value in chain_tvls.items()
+            if chain.lower() in view.chains and isinstance(value, (int, float))
+        )
+        
+    return ProtocolData(
+        name=row.get('name', 'Unknown'),
+        tvl=float(tvl_val),
+        change_1d=float(change_val),
+        chain=view.label,
+        category=row.get('category', 'Unknown'),
+        logo=row.get('logo', '')
+    )
+
+
+def _pool_item(row: Dict, view: "ViewConfig") -> Optional[YieldPool]:
+    """Build YieldPool from a /pools row, None if it has invalid data."""
+    apy = row.get('apy')
+    tvl_usd = row.get('tvlUsd', 0)
+    if not (isinstance(apy, (int, float)) and apy > 0 and isinstance(tvl_usd, (int, float))):
+        return None
+        
+    return YieldPool(
+        protocol=row.get('project', ''),
+        symbol=row.get('symbol', ''),
+        apy=float(apy),
+        tvl_usd=float(tvl_usd),
+        stable=bool(row.get('stablecoin', False))
+    )
+
+
+def _dex_item(row: Dict, view: "ViewConfig") -> Optional[DexData]:
+    """Build DexData from an /overview/dexs row, None if it has invalid data."""
+    volume_24h = row.get('total24h')
+    change_24h = row.get('change_1d')
+    fees_24h = (row.get('totalAllTime') or 0) * 0.01  # Estimate daily fees
+    
+    if not (isinstance(volume_24h, (int, float)) and volume_24h > 0 and
+            isinstance(change_24h, (int, float))):
+        return None
+        
+    return DexData(
+        name=row.get('name', 'Unknown'),
+        volume_24h=float(volume_24h),
+        change_24h=float(change_24h),
+        fees_24h=float(fees_24h)
+    )
+
+
+@dataclass
+class SourceConfig:
+    """An upstream DeFiLlama document that one or more views are derived from."""
+    url: str
+    prefix: str  # ijson prefix of the rows
+    ttl: timedelta
+    item_type: type
+    build_item: Callable[[Dict, "ViewConfig"], Optional[Any]]
+    tvl_field: Optional[str] = None  # Row field used by min_tvl
+
+
+@dataclass
+class ViewConfig:
+    """
+    Declarative top-K view over the rows of one source.
+    
+    Rows must match every filter that is set; matching rows are ranked by
+    the `rank_by` attribute of the built item.
+    """
+    name: str
+    source: str
+    rank_by: str
+    k: int
+    chains: List[str] = field(default_factory=list)  # Lowercase, empty for any chain
+    min_tvl: Optional[float] = None
+    stablecoin: Optional[bool] = None
+    symbols: List[str] = field(default_factory=list)  # Uppercase pool symbols
+    categories: List[str] = field(default_factory=list)
+    chain_tvl: bool = False  # Rank protocols by TVL on `chains` only
+    label: str = "ethereum"  # Chain label on ProtocolData items
+    
+    def matches(self, row: Dict, source: SourceConfig) -> bool:
+        if self.chains and not any(chain in self.chains for chain in _row_chains(row)):
+            return False
+        if self.min_tvl is not None:
+            tvl = row.get(source.tvl_field)
+            if not isinstance(tvl, (int, float)) or tvl <= self.min_tvl:
+                return False
+        if self.stablecoin is not None and bool(row.get('stablecoin', False)) != self.stablecoin:
+            return False
+        if self.symbols and str(row.get('symbol', '')).upper() not in self.symbols:
+            return False
+        if self.categories and row.get('category') not in self.categories:
+            return False
+        return True
+
+
+SOURCES = {
+    "protocols": SourceConfig(
+        url="https://api.llama.fi/protocols",
+        prefix="item",
+        ttl=timedelta(minutes=5),
+        item_type=ProtocolData,
+        build_item=_protocol_item,
+        tvl_field="tvl"
+    ),
+    "pools": SourceConfig(
+        url="https://yields.llama.fi/pools",
+        prefix="data.item",
+        ttl=timedelta(minutes=2),
+        item_type=YieldPool,
+        build_item=_pool_item,
+        tvl_field="tvlUsd"
+    ),
+    "dexs": SourceConfig(
+        url="https://api.llama.fi/overview/dexs/ethereum",
+        prefix="protocols.item",
+        ttl=timedelta(minutes=1),
+        item_type=DexData,
+        build_item=_dex_item
+    ),
+}
+
+L2_CHAINS = ["arbitrum", "base", "optimism", "op mainnet", "zksync era", "linea", "scroll", "blast"]
+LST_SYMBOLS = ["STETH", "WSTETH", "RETH", "CBETH", "SFRXETH", "METH", "WBETH", "OSETH", "ETHX", "SWETH"]
+
+VIEWS = [
+    ViewConfig(name="protocols_eth", source="protocols", rank_by="tvl", k=10, chains=["ethereum"]),
+    ViewConfig(name="protocols_l2", source="protocols", rank_by="tvl", k=10, chains=L2_CHAINS,
+               chain_tvl=True, label="l2"),
+    ViewConfig(name="yields_eth", source="pools", rank_by="apy", k=8, chains=["ethereum"],
+               min_tvl=100000),  # Min $100k TVL
+    ViewConfig(name="yields_eth_stable", source="pools", rank_by="apy", k=8, chains=["ethereum"],
+               min_tvl=1000000, stablecoin=True),
+    ViewConfig(name="yields_eth_lst", source="pools", rank_by="apy", k=8, chains=["ethereum"],
+               min_tvl=1000000, symbols=LST_SYMBOLS),
+    ViewConfig(name="volumes_eth", source="dexs", rank_by="volume_24h", k=6),
+]
+
+
+def _view_ranker(view: ViewConfig, source: SourceConfig) -> Callable[[Dict], Optional[Tuple[float, Any]]]:
+    """Build the rank function StreamingTopK uses for a view."""
+    def rank(row: Dict) -> Optional[Tuple[float, Any]]:
+        if not view.matches(row, source):
+            return None
+        item = source.build_item(row, view)
+        if item is None:
+            return None
+        return getattr(item, view.rank_by), item
+    return rank
+
+
 class DeFiLlamaClient:
     """
     Async client for DeFiLlama API with caching and error handling.
     
+    The cache is keyed by source and holds the top-K items of every view
+    derived from it. It uses stale-while-revalidate: expired data is still
+    served immediately while a single background refresh per source
+    fetches new data. If the refresh fails the last good data is kept.
+    
     Provides methods to fetch Ethereum DeFi data including:
     - Protocol TVL data
     - Yield/APY opportunities  
     - DEX volume and trading data
+    
+    With a cache directory, filtered results are also kept on disk
+    (gzipped JSON per source) along with the upstream ETag and
+    Last-Modified headers. They are loaded at startup and revalidated
+    with conditional requests.
     """
     
-    def __init__(self):
-        """Initialize the DeFiLlama client with default configuration."""
-        self.base_url = "https://api.llama.fi"
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        sources: Dict[str, SourceConfig] = SOURCES,
+        views: List[ViewConfig] = VIEWS
+    ):
+        """
+        Initialize the DeFiLlama client with default configuration.
+        
+        Args:
+            cache_dir: Directory for the persistent cache, None to disable it
+            sources: Source name -> upstream document configuration
+            views: Derived top-K views, each reading one of the sources
+        """
         self.client = httpx.AsyncClient(timeout=30.0)
         self._cache: Dict[str, Dict[str, Any]] = {}
-        self._cache_duration = {
-            "protocols": timedelta(minutes=5),
-            "yields": timedelta(minutes=2),
-            "volumes": timedelta(minutes=1)
-        }
+        self.sources = sources
+        self.views = {view.name: view for view in views}
+        # Parsing, filtering and ranking run on a worker thread so large
+        # payloads never stall the event loop. A single worker keeps each
+        # streaming parser's chunks in order.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="defillama")
+        # Source name -> seconds spent per stage of the last fetch
+        self.stage_timings: Dict[str, Dict[str, float]] = {}
+        # In-flight refresh per source, shared by all concurrent callers
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._retry_after: Dict[str, datetime] = {}
+        # Source name -> ETag / Last-Modified of the upstream response
+        self._validators: Dict[str, Dict[str, str]] = {}
+        self.cache_dir = cache_dir
+        if cache_dir:
+            self._load_disk_cache()
     
-    def _get_cached(self, key: str) -> Optional[Any]:
+    def _is_fresh(self, key: str) -> bool:
         """
-        Retrieve cached data if it exists and hasn't expired.
+        Check whether cached data is younger than its cache duration.
         
         Args:
             key: Cache key to look up
             
         Returns:
-            Cached data if valid, None if expired or missing
+            True if the data is cached and hasn't expired
         """
-        if key not in self._cache:
-            return None
+        cache_entry = self._cache.get(key)
+        if not cache_entry or cache_entry["timestamp"] is None:
+            return False
             
-        cache_entry = self._cache[key]
-        cache_time = cache_entry.get("timestamp")
-        cache_duration = self._cache_duration.get(key.split("_")[0], timedelta(minutes=5))
+        return datetime.now() - cache_entry["timestamp"] < self.sources[key].ttl
+    
+    def get_data_age(self, view_name: str) -> Optional[float]:
+        """
+        Get the age of a view's cached data in seconds.
         
-        if cache_time and datetime.now() - cache_time < cache_duration:
-            return cache_entry.get("data")
+        Args:
+            view_name: Name of the view to look up
             
-        # Cache expired, remove it
-        del self._cache[key]
-        return None
+        Returns:
+            Seconds since the data was fetched, None if nothing is cached
+            or the cached data has not been refreshed since loading an
+            incomplete disk cache
+        """
+        cache_entry = self._cache.get(self.views[view_name].source)
+        if not cache_entry or cache_entry["timestamp"] is None:
+            return None
+        return (datetime.now() - cache_entry["timestamp"]).total_seconds()
+    
+    async def get_view(self, view_name: str) -> List[Any]:
+        """
+        Get the top-K items of a view, refreshing its source in the
+        background once expired.
+        
+        Only waits on the upstream API when nothing has been cached yet,
+        and then shares the fetch with any other waiting callers.
+        
+        Args:
+            view_name: Name of the view to get
+            
+        Returns:
+            Cached or freshly fetched items, empty list if neither is available
+        """
+        key = self.views[view_name].source
+        if key in self._cache:
+            if not self._is_fresh(key):
+                self._start_refresh(key)
+            return self._cache[key]["data"].get(view_name, [])
+            
+        task = self._start_refresh(key)
+        if task is None:
+            return []
+        data = await asyncio.shield(task)
+        return data.get(view_name, [])
+    
+    def _start_refresh(self, key: str) -> Optional[asyncio.Task]:
+        """Start a refresh for a source unless one is running or a retry is pending."""
+        task = self._refreshing.get(key)
+        if task is not None:
+            return task
+        if key in self._retry_after and datetime.now() < self._retry_after[key]:
+            return None
+            
+        task = asyncio.create_task(self._refresh(key))
+        self._refreshing[key] = task
+        return task
+    
+    async def _refresh(self, key: str) -> Dict[str, List[Any]]:
+        """Fetch and cache fresh data for a source, keeping the last good data on failure."""
+        try:
+            data = await self._fetch_source(key)
+            if data is NOT_MODIFIED:
+                data = self._cache[key]["data"]
+                logger.info(f"{key} not modified upstream")
+            self._set_cache(key, data)
+            self._retry_after.pop(key, None)
+            if self.cache_dir:
+                await self._run_in_worker(self._write_disk_cache, key)
+            return data
+        except Exception as e:
+            logger.error(f"Failed to refresh {key}, keeping last good data: {e}")
+            self._retry_after[key] = datetime.now() + REFRESH_RETRY_DELAY
+            cache_entry = self._cache.get(key)
+            return cache_entry["data"] if cache_entry else {}
+        finally:
+            self._refreshing.pop(key, None)
     
     def _set_cache(self, key: str, data: Any) -> None:
         """
         Store data in cache with timestamp.
         
         Args:
-            key: Cache key to store under
+            key: Source name to store under
             data: Data to cache
         """
         self._cache[key] = {
@@ -103,6 +460,134 @@ class DeFiLlamaClient:
             "timestamp": datetime.now()
         }
     
+    def _disk_cache_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json.gz")
+    
+    def _load_disk_cache(self) -> None:
+        """Load cached results and upstream validators saved by a previous run."""
+        for key, source in self.sources.items():
+            path = self._disk_cache_path(key)
+            if not os.path.isfile(path):
+                continue
+            try:
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    entry = json.load(f)
+                # Views added since the file was written are computed on the next refresh
+                missing_views = [
+                    name for name, view in self.views.items()
+                    if view.source == key and name not in entry["views"]
+                ]
+                self._cache[key] = {
+                    "data": {
+                        name: [source.item_type(**item) for item in items]
+                        for name, items in entry["views"].items()
+                        if name in self.views
+                    },
+                    # No timestamp until refreshed: stale, and reported as having no data age
+                    "timestamp": datetime.fromisoformat(entry["timestamp"]) if not missing_views else None
+                }
+                self._validators[key] = entry.get("validators", {}) if not missing_views else {}
+                logger.info(f"Loaded cached {key} views from disk")
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable DeFiLlama cache file {path}: {e}")
+    
+    def _write_disk_cache(self, key: str) -> None:
+        """Write one cache entry to disk, atomically replacing the old file."""
+        cache_entry = self._cache[key]
+        entry = {
+            "timestamp": cache_entry["timestamp"].isoformat(),
+            "validators": self._validators.get(key, {}),
+            "views": {
+                name: [asdict(item) for item in items]
+                for name, items in cache_entry["data"].items()
+            }
+        }
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._disk_cache_path(key)
+        with gzip.open(f"{path}.tmp", "wt", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(f"{path}.tmp", path)
+    
+    def _conditional_headers(self, key: str) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for cached data."""
+        if key not in self._cache:
+            return {}
+        validators = self._validators.get(key, {})
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
+    
+    def _store_validators(self, key: str, response: httpx.Response) -> None:
+        """Remember the ETag / Last-Modified of a successful response."""
+        self._validators[key] = {
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified")
+        }
+    
+    async def _run_in_worker(self, func: Callable, *args) -> Any:
+        """Run a CPU-bound function on the worker thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+    
+    def _record_timings(self, name: str, started: float, process_seconds: float) -> None:
+        """Store and log download/process/total seconds of a fetch."""
+        total = time.monotonic() - started
+        self.stage_timings[name] = {
+            "download": round(total - process_seconds, 3),
+            "process": round(process_seconds, 3),
+            "total": round(total, 3)
+        }
+        logger.info(f"DeFiLlama {name} timings: {self.stage_timings[name]}")
+    
+    async def _fetch_source(self, key: str) -> Any:
+        """
+        Download a source document and compute the top K items of every
+        view derived from it in a single pass.
+        
+        The response is parsed incrementally as chunks arrive instead of
+        materializing the whole document with response.json().
+        
+        Args:
+            key: Source name
+            
+        Returns:
+            View name -> up to K items (highest first), or NOT_MODIFIED on a 304
+        """
+        source = self.sources[key]
+        rankers = {
+            name: (_view_ranker(view, source), view.k)
+            for name, view in self.views.items()
+            if view.source == key
+        }
+        
+        started = time.monotonic()
+        process_seconds = 0.0
+        ranker = StreamingTopK(source.prefix, rankers)
+        async with self.client.stream("GET", source.url, headers=self._conditional_headers(key)) as response:
+            if response.status_code == 304:
+                self._record_timings(key, started, 0.0)
+                return NOT_MODIFIED
+            response.raise_for_status()
+            self._store_validators(key, response)
+            async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+                chunk_started = time.monotonic()
+                await self._run_in_worker(ranker.feed, chunk)
+                process_seconds += time.monotonic() - chunk_started
+        
+        close_started = time.monotonic()
+        result = await self._run_in_worker(ranker.close)
+        process_seconds += time.monotonic() - close_started
+        
+        self._record_timings(key, started, process_seconds)
+        logger.info(
+            f"Fetched {key}: {ranker.items_seen} rows -> "
+            + ", ".join(f"{name}={len(items)}" for name, items in result.items())
+        )
+        return result
+    
     async def get_ethereum_protocols(self) -> List[ProtocolData]:
         """
         Get top Ethereum DeFi protocols by TVL.
@@ -110,52 +595,7 @@ class DeFiLlamaClient:
         Returns:
             List of ProtocolData objects sorted by TVL (highest first)
         """
-        cached = self._get_cached("protocols_eth")
-        if cached:
-            return cached
-            
-        try:
-            response = await self.client.get(f"{self.base_url}/protocols")
-            response.raise_for_status()
-            protocols = response.json()
-            
-            # Filter for Ethereum protocols
-            eth_protocols = []
-            for p in protocols:
-                chains = p.get('chains', [])
-                if not isinstance(chains, list):
-                    continue
-                    
-                # Check if protocol supports Ethereum
-                if 'Ethereum' in chains or 'ethereum' in [c.lower() for c in chains]:
-                    tvl_val = p.get('tvl')
-                    change_val = p.get('change_1d')
-                    
-                    # Skip protocols with invalid data
-                    if tvl_val is None or change_val is None:
-                        continue
-                        
-                    protocol_data = ProtocolData(
-                        name=p.get('name', 'Unknown'),
-                        tvl=float(tvl_val),
-                        change_1d=float(change_val),
-                        chain='ethereum',
-                        category=p.get('category', 'Unknown'),
-                        logo=p.get('logo', '')
-                    )
-                    eth_protocols.append(protocol_data)
-            
-            # Sort by TVL and take top 10
-            eth_protocols.sort(key=lambda x: x.tvl, reverse=True)
-            result = eth_protocols[:10]
-            
-            self._set_cache("protocols_eth", result)
-            logger.info(f"Fetched {len(result)} Ethereum protocols")
-            return result
-            
-        except Exception as e:
-            logger.error(f"Failed to fetch Ethereum protocols: {e}")
-            return []
+        return await self.get_view("protocols_eth")
     
     async def get_top_yields(self) -> List[YieldPool]:
         """
@@ -164,56 +604,7 @@ class DeFiLlamaClient:
         Returns:
             List of YieldPool objects sorted by APY (highest first)
         """
-        cached = self._get_cached("yields_eth")
-        if cached:
-            return cached
-            
-        try:
-            # Use the yields API endpoint from DeFiLlama docs
-            response = await self.client.get("https://yields.llama.fi/pools")
-            response.raise_for_status()
-            data = response.json()
-            
-            pools_data = data.get('data', [])
-            if not isinstance(pools_data, list):
-                logger.warning("Unexpected pools data format")
-                return []
-            
-            # Filter for Ethereum pools with good APY
-            eth_pools = []
-            for pool in pools_data:
-                if not isinstance(pool, dict):
-                    continue
-                    
-                chain = pool.get('chain', '').lower()
-                apy = pool.get('apy')
-                tvl_usd = pool.get('tvlUsd', 0)
-                
-                # Filter for Ethereum pools with valid data
-                if (chain == 'ethereum' and 
-                    isinstance(apy, (int, float)) and apy > 0 and
-                    isinstance(tvl_usd, (int, float)) and tvl_usd > 100000):  # Min $100k TVL
-                    
-                    yield_pool = YieldPool(
-                        protocol=pool.get('project', ''),
-                        symbol=pool.get('symbol', ''),
-                        apy=float(apy),
-                        tvl_usd=float(tvl_usd),
-                        stable=bool(pool.get('stablecoin', False))
-                    )
-                    eth_pools.append(yield_pool)
-            
-            # Sort by APY and take top 8
-            eth_pools.sort(key=lambda x: x.apy, reverse=True)
-            result = eth_pools[:8]
-            
-            self._set_cache("yields_eth", result)
-            logger.info(f"Fetched {len(result)} Ethereum yield pools")
-            return result
-            
-        except Exception as e:
-            logger.error(f"Failed to fetch Ethereum yields: {e}")
-            return []
+        return await self.get_view("yields_eth")
     
     async def get_dex_volumes(self) -> List[DexData]:
         """
@@ -222,56 +613,12 @@ class DeFiLlamaClient:
         Returns:
             List of DexData objects sorted by 24h volume (highest first)
         """
-        cached = self._get_cached("volumes_eth")
-        if cached:
-            return cached
-            
-        try:
-            response = await self.client.get(f"{self.base_url}/overview/dexs/ethereum")
-            response.raise_for_status()
-            data = response.json()
-            
-            protocols = data.get('protocols', [])
-            if not isinstance(protocols, list):
-                logger.warning("Unexpected DEX data format")
-                return []
-            
-            # Process DEX data
-            dex_data = []
-            for dex in protocols:
-                if not isinstance(dex, dict):
-                    continue
-                    
-                volume_24h = dex.get('total24h')
-                change_24h = dex.get('change_1d')
-                fees_24h = dex.get('totalAllTime', 0) * 0.01  # Estimate daily fees
-                
-                if (isinstance(volume_24h, (int, float)) and volume_24h > 0 and
-                    isinstance(change_24h, (int, float))):
-                    
-                    dex_info = DexData(
-                        name=dex.get('name', 'Unknown'),
-                        volume_24h=float(volume_24h),
-                        change_24h=float(change_24h),
-                        fees_24h=float(fees_24h)
-                    )
-                    dex_data.append(dex_info)
-            
-            # Sort by volume and take top 6
-            dex_data.sort(key=lambda x: x.volume_24h, reverse=True)
-            result = dex_data[:6]
-            
-            self._set_cache("volumes_eth", result)
-            logger.info(f"Fetched {len(result)} Ethereum DEX volumes")
-            return result
-            
-        except Exception as e:
-            logger.error(f"Failed to fetch DEX volumes: {e}")
-            return []
+        return await self.get_view("volumes_eth")
     
     async def close(self):
-        """Close the HTTP client connection."""
+        """Close the HTTP client connection and worker thread."""
         await self.client.aclose()
+        self._executor.shutdown(wait=False)
     
     def __del__(self):
         """Cleanup on object destruction."""
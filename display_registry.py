@@ -0,0 +1,87 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional, Set
+
+from display_scheduler import DisplayScheduler
+
+class Display:
+    """One Divoom device with its own view rotation, rate limit and push scheduler"""
+
+    def __init__(self, name: str, divoom_client, rotation, scheduler: DisplayScheduler):
+        self.name = name
+        self.divoom_client = divoom_client
+        self.rotation = rotation
+        self.scheduler = scheduler
+
+    def current_view_name(self) -> Optional[str]:
+        view = self.rotation.get_current_view()
+        return view.name if view else None
+
+class DisplayRegistry:
+    """All configured displays, sharing one data layer and one render engine.
+
+    Frames are rendered once per view; every display showing that view
+    pushes the same frame through its own scheduler.
+    """
+
+    def __init__(self):
+        self.displays: Dict[str, Display] = {}
+        self._prewarm_tasks: List[asyncio.Task] = []
+
+    def add(self, display: Display):
+        if display.name in self.displays:
+            raise ValueError(f"Duplicate display name: {display.name}")
+        self.displays[display.name] = display
+
+    def get(self, name: Optional[str] = None) -> Optional[Display]:
+        """Get a display by name, or the first configured display"""
+        if name is None:
+            return next(iter(self.displays.values()), None)
+        return self.displays.get(name)
+
+    def enabled_views(self) -> Set[str]:
+        return {view for display in self.displays.values() for view in display.rotation.views}
+
+    def current_views(self) -> Set[str]:
+        return {name for name in (d.current_view_name() for d in self.displays.values()) if name}
+
+    def wanted_views(self) -> Set[str]:
+        """Views shown on any display, plus the next view of displays about to switch"""
+        wanted = set()
+        for display in self.displays.values():
+            wanted |= display.rotation.get_wanted_views()
+        wanted.discard(None)
+        return wanted
+
+    def trigger_all(self, reason: str):
+        for display in self.displays.values():
+            display.scheduler.trigger(reason)
+
+    def trigger_view(self, view_name: str, reason: str):
+        """Trigger the displays currently showing a view"""
+        for display in self.displays.values():
+            if display.current_view_name() == view_name:
+                display.scheduler.trigger(reason)
+
+    def start(self):
+        for display in self.displays.values():
+            display.scheduler.start()
+            self._prewarm_tasks.append(asyncio.create_task(display.rotation.run_prewarm()))
+        logging.info(f"Started {len(self.displays)} display(s): {', '.join(self.displays)}")
+
+    async def stop(self):
+        for task in self._prewarm_tasks:
+            task.cancel()
+        self._prewarm_tasks = []
+        for display in self.displays.values():
+            await display.scheduler.stop()
+
+    def get_metrics(self) -> Dict[str, Dict]:
+        return {
+            name: {
+                "endpoint": display.divoom_client.api_endpoint,
+                "view": display.current_view_name(),
+                "scheduler": display.scheduler.get_metrics()
+            }
+            for name, display in self.displays.items()
+        }
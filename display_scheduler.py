@@ -0,0 +1,220 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+# Views whose content changes with every block; only head/slot/view triggers
+# push them, so the device rate limit is spent on new blocks
+SLOT_CRITICAL_VIEWS = {"overview", "execution", "proposer", "mev"}
+# Triggers that always lead to a push when allowed
+URGENT_TRIGGERS = {"view"}
+SLOT_TRIGGERS = {"head", "slot"}
+DEFAULT_TICK_INTERVAL = 4
+# Seconds a push waits for a frame rendered after its trigger before using the newest one
+FRAME_WAIT_TIMEOUT = 3
+# Slack after the expected block arrival before pushing without a head event
+ARRIVAL_GRACE_SECONDS = 1
+
+class DisplayScheduler:
+    """Single place deciding when a frame is pushed to a Divoom display.
+
+    Triggers (head event, slot tick, view change, changed frame, periodic
+    tick) are merged into one pending push. When the device rate limit is
+    in effect the push is deferred until it is allowed again, and then the
+    newest frame is sent instead of the trigger being dropped.
+
+    With a slot clock, pushes of slot-critical views that are not caused
+    by a head event (slot ticks, deferred pushes) wait until the current
+    slot's block has arrived: on its head event, or at the time blocks
+    typically arrive if the head event does not come.
+    """
+
+    def __init__(
+        self,
+        divoom_client,
+        capture: Callable[[float, float], Awaitable[Optional[bytes]]],
+        get_current_view: Callable[[], Optional[object]],
+        slot_critical_views: Set[str] = SLOT_CRITICAL_VIEWS,
+        slot_clock: Optional[Callable[[], Tuple[float, float]]] = None
+    ):
+        """
+        `slot_clock` returns (start, expected block arrival) times of the
+        current slot; without it pushes are not aligned to blocks.
+        """
+        self.divoom_client = divoom_client
+        self.capture = capture
+        self.get_current_view = get_current_view
+        self.slot_critical_views = slot_critical_views
+        self.slot_clock = slot_clock
+        self._wakeup: Optional[asyncio.Event] = None
+        self._head_seen: Optional[asyncio.Event] = None
+        self._last_head_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+        # Reasons of the pending push and when its first trigger arrived
+        self._pending: Dict[str, int] = {}
+        self._pending_since: Optional[float] = None
+        self._last_frame: Optional[bytes] = None
+        self._last_view: Optional[str] = None
+
+        self.pushes = 0
+        self.deferred = 0
+        self.merged_triggers = 0
+        self.ignored_triggers = 0
+        self.unchanged_frames = 0
+        self.errors = 0
+        self.aligned_waits = 0
+        self.aligned_timeouts = 0
+        self.trigger_counts: Dict[str, int] = {}
+        self.last_push_at: Optional[float] = None
+        self.last_push_reasons: List[str] = []
+        self._latencies: List[float] = []
+
+    def start(self):
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._head_seen = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def trigger(self, reason: str):
+        """Request a push; merged with any push already pending"""
+        self.trigger_counts[reason] = self.trigger_counts.get(reason, 0) + 1
+        if reason == "head":
+            self._last_head_at = time.time()
+            if self._head_seen:
+                self._head_seen.set()
+
+        view = self.get_current_view()
+        view_name = getattr(view, 'name', None)
+        if not self._is_relevant(reason, view_name):
+            self.ignored_triggers += 1
+            return
+
+        if self._pending:
+            self.merged_triggers += 1
+        else:
+            self._pending_since = time.time()
+        self._pending[reason] = self._pending.get(reason, 0) + 1
+        if self._wakeup:
+            self._wakeup.set()
+
+    def _is_relevant(self, reason: str, view_name: Optional[str]) -> bool:
+        if reason in URGENT_TRIGGERS:
+            return True
+        slot_critical = view_name in self.slot_critical_views
+        if reason in SLOT_TRIGGERS:
+            return slot_critical
+        # Changed frames and ticks would spend the rate limit right before a block
+        return not slot_critical
+
+    def _tick_interval(self) -> float:
+        view = self.get_current_view()
+        interval = getattr(view, 'refresh_interval', 0) or DEFAULT_TICK_INTERVAL
+        return max(interval, 1)
+
+    async def _run(self):
+        while True:
+            try:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self._tick_interval())
+                except asyncio.TimeoutError:
+                    self.trigger("tick")
+
+                view = self.get_current_view()
+                view_name = getattr(view, 'name', None)
+                if view_name != self._last_view:
+                    self.trigger("view")
+                if not self._pending:
+                    self._wakeup.clear()
+                    continue
+
+                # Defer rather than drop while the device is rate limited;
+                # triggers arriving meanwhile merge into this push
+                wait = self.divoom_client.seconds_until_ready()
+                if wait > 0:
+                    self.deferred += 1
+                    await asyncio.sleep(wait)
+                if view_name in self.slot_critical_views:
+                    await self._wait_for_block()
+
+                reasons, since = self._pending, self._pending_since
+                self._pending, self._pending_since = {}, None
+                self._wakeup.clear()
+                await self._push(view_name, reasons, since)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                logging.error(f"Display scheduler error: {e}")
+                await asyncio.sleep(1)
+
+    async def _wait_for_block(self):
+        """Wait for the current slot's block unless its head event was already seen"""
+        if not self.slot_clock:
+            return
+        slot_start, expected_arrival = self.slot_clock()
+        if self._last_head_at >= slot_start:
+            return
+
+        self.aligned_waits += 1
+        self._head_seen.clear()
+        deadline = expected_arrival + ARRIVAL_GRACE_SECONDS
+        while self._last_head_at < slot_start:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                # Missed or late block: show what we have
+                self.aligned_timeouts += 1
+                return
+            try:
+                await asyncio.wait_for(self._head_seen.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                pass
+            self._head_seen.clear()
+
+    async def _push(self, view_name: Optional[str], reasons: Dict[str, int], since: float):
+        # Capture a frame rendered after the block, not only after the first trigger
+        since = max(since, self._last_head_at)
+        frame = await self.capture(since, FRAME_WAIT_TIMEOUT)
+        if not frame:
+            return
+        if frame == self._last_frame and not set(reasons) & URGENT_TRIGGERS:
+            self.unchanged_frames += 1
+            return
+
+        if await self.divoom_client.update_display(frame):
+            now = time.time()
+            self.pushes += 1
+            self.last_push_at = now
+            self.last_push_reasons = sorted(reasons)
+            self._last_frame = frame
+            self._last_view = view_name
+            self._latencies = (self._latencies + [now - since])[-100:]
+
+    def get_metrics(self) -> Dict:
+        latencies = self._latencies
+        return {
+            "pushes": self.pushes,
+            "deferred": self.deferred,
+            "merged_triggers": self.merged_triggers,
+            "ignored_triggers": self.ignored_triggers,
+            "unchanged_frames": self.unchanged_frames,
+            "errors": self.errors,
+            "aligned_waits": self.aligned_waits,
+            "aligned_timeouts": self.aligned_timeouts,
+            "triggers": self.trigger_counts,
+            "last_push_at": self.last_push_at,
+            "last_push_reasons": self.last_push_reasons,
+            "push_latency": {
+                "last": round(latencies[-1], 3) if latencies else None,
+                "avg": round(sum(latencies) / len(latencies), 3) if latencies else None,
+                "max": round(max(latencies), 3) if latencies else None
+            }
+        }
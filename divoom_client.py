@@ -10,10 +10,15 @@ class DivoomClient:
         self.request_interval_seconds = request_interval_seconds
         self.last_update = 0
 
-    async def update_display(self, image_data: bytes, x: int = 0, y: int = 0, push_immediately: bool = True):
+    def seconds_until_ready(self) -> float:
+        """Seconds until the rate limit allows the next push"""
+        return max(0.0, self.last_update + self.request_interval_seconds - time.time())
+
+    async def update_display(self, image_data: bytes, x: int = 0, y: int = 0, push_immediately: bool = True) -> bool:
+        """Push an image, returning False if it was dropped by the rate limit"""
         now = time.time()
         if now - self.last_update < self.request_interval_seconds:
-            return
+            return False
             
         # Convert bytes to PIL Image
         image = Image.open(io.BytesIO(image_data))
@@ -39,4 +44,5 @@ class DivoomClient:
             async with session.post(f"{self.api_endpoint}/image", data=form_data) as response:
                 if response.status != 200:
                     raise Exception(f"Failed to update Divoom display: {await response.text()}")
-                self.last_update = now
\ No newline at end of file
+                self.last_update = now
+                return True
\ No newline at end of file
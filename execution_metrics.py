@@ -0,0 +1,113 @@
+import numpy as np
+from typing import Dict, List, Optional
+
+# One day of mainnet slots (12s slots)
+DEFAULT_EXECUTION_WINDOW_SLOTS = 7200
+
+class ExecutionMetricsWindow:
+    """Slot-indexed ring of per-block execution metrics backed by NumPy arrays.
+
+    Blocks can be recorded in any order (head events, backfill, restored
+    state); each slot maps to position `slot % capacity`. Window stats are
+    cached until the next block is recorded, so repeated reads are O(1).
+    """
+
+    def __init__(self, capacity: int = DEFAULT_EXECUTION_WINDOW_SLOTS):
+        self.capacity = capacity
+        self._slots = np.full(capacity, -1, dtype=np.int64)
+        self._base_fee = np.zeros(capacity, dtype=np.float64)  # gwei
+        self._gas_used = np.zeros(capacity, dtype=np.int64)
+        self._gas_limit = np.zeros(capacity, dtype=np.int64)
+        self._tx_count = np.zeros(capacity, dtype=np.int32)
+        self._extra_data: Dict[int, str] = {}
+        self.head_slot = -1
+        self._stats_cache: Dict[tuple, Dict] = {}
+
+    def record(self, slot: int, summary: Dict) -> bool:
+        """Record the execution fields of a block summary"""
+        if 'base_fee_per_gas' not in summary or slot <= self.head_slot - self.capacity:
+            return False
+
+        index = slot % self.capacity
+        self._slots[index] = slot
+        self._base_fee[index] = summary['base_fee_per_gas'] / 1e9
+        self._gas_used[index] = summary['gas_used']
+        self._gas_limit[index] = summary['gas_limit']
+        self._tx_count[index] = summary['tx_count']
+        self._extra_data[index] = summary.get('extra_data', '')
+
+        self.head_slot = max(self.head_slot, slot)
+        self._stats_cache.clear()
+        return True
+
+    def _window_indexes(self, slots: int) -> np.ndarray:
+        """Ring positions holding blocks from the newest `slots` slots, oldest first"""
+        slots = min(slots, self.capacity)
+        wanted = np.arange(self.head_slot - slots + 1, self.head_slot + 1)
+        indexes = wanted % self.capacity
+        return indexes[self._slots[indexes] == wanted]
+
+    def get_latest(self) -> Optional[Dict]:
+        if self.head_slot < 0:
+            return None
+
+        index = self.head_slot % self.capacity
+        gas_used = int(self._gas_used[index])
+        gas_limit = int(self._gas_limit[index])
+        return {
+            "slot": self.head_slot,
+            "base_fee": round(float(self._base_fee[index]), 2),
+            "gas_used": gas_used,
+            "gas_limit": gas_limit,
+            "utilization": round((gas_used / gas_limit) * 100, 1) if gas_limit else 0,
+            "tx_count": int(self._tx_count[index]),
+            "extra_data": _decode_extra_data(self._extra_data.get(index, ''))
+        }
+
+    def get_window_stats(self, slots: int, points: int = 0) -> Dict:
+        """Totals and averages over the newest `slots` slots, plus an optional
+        base fee / utilization trend bucketed into `points` averages"""
+        key = (slots, points)
+        if key in self._stats_cache:
+            return self._stats_cache[key]
+
+        indexes = self._window_indexes(slots) if self.head_slot >= 0 else np.array([], dtype=np.int64)
+        if not len(indexes):
+            return {"slots": slots, "blocks_counted": 0, "total_tx": 0}
+
+        base_fee = self._base_fee[indexes]
+        utilization = self._gas_used[indexes] / np.maximum(self._gas_limit[indexes], 1) * 100
+        tx_count = self._tx_count[indexes]
+        stats = {
+            "slots": slots,
+            "blocks_counted": int(len(indexes)),
+            "total_tx": int(tx_count.sum()),
+            "avg_tx_count": round(float(tx_count.mean()), 1),
+            "avg_base_fee": round(float(base_fee.mean()), 2),
+            "min_base_fee": round(float(base_fee.min()), 2),
+            "max_base_fee": round(float(base_fee.max()), 2),
+            "avg_utilization": round(float(utilization.mean()), 1)
+        }
+        if points > 0:
+            stats["trend"] = _bucket_trend(self._slots[indexes], base_fee, utilization, points)
+
+        self._stats_cache[key] = stats
+        return stats
+
+def _bucket_trend(slots: np.ndarray, base_fee: np.ndarray, utilization: np.ndarray, points: int) -> List[Dict]:
+    trend = []
+    for bucket in np.array_split(np.arange(len(slots)), min(points, len(slots))):
+        trend.append({
+            "slot": int(slots[bucket[-1]]),
+            "base_fee": round(float(base_fee[bucket].mean()), 2),
+            "utilization": round(float(utilization[bucket].mean()), 1)
+        })
+    return trend
+
+def _decode_extra_data(extra_data: str) -> Optional[str]:
+    """Decode the hex extra_data field, returning None if it is not readable text"""
+    try:
+        decoded = bytes.fromhex(extra_data[2:]).decode('utf-8').strip()
+        return decoded if decoded else None
+    except (ValueError, UnicodeDecodeError):
+        return None
@@ -3,26 +3,142 @@ import asyncio
 import aiohttp
 import json
 import logging
-from typing import Dict, List, Optional
+import random
+import time
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Samples kept per chain (about an hour at one event per 5s)
+DEFAULT_L2_HISTORY_SAMPLES = 720
+# Chains with history; the least recently updated chain is dropped beyond this
+MAX_L2_HISTORY_CHAINS = 64
+# Weight of the newest sample in the smoothed TPS
+L2_EWMA_ALPHA = 0.2
+# Reconnect if the stream sends nothing for this long
+L2_STREAM_IDLE_TIMEOUT = 30
+# Reconnect delay doubles per failed attempt, from the base up to the max
+L2_RECONNECT_BASE_DELAY = 1
+L2_RECONNECT_MAX_DELAY = 60
+# Chains without an update for this long are dropped from the totals and ranking
+L2_CHAIN_EXPIRY = timedelta(minutes=2)
+# Events per second are counted over this many seconds
+L2_EVENT_RATE_WINDOW = 10
+# While the layer2 view is not shown, connect for this many seconds every interval
+L2_KEEP_WARM_DURATION = 15
+L2_KEEP_WARM_INTERVAL = 300
+
 @dataclass
 class L2Metrics:
+    # Records are updated in place on every event, so avoid a per-instance dict
+    __slots__ = ('name', 'tps', 'gas_used', 'last_updated')
+
     name: str
     tps: float
     gas_used: int
     last_updated: datetime
 
+class L2ChainHistory:
+    """Fixed-size ring buffer of timestamped TPS/gas samples for one chain"""
+
+    def __init__(self, capacity: int = DEFAULT_L2_HISTORY_SAMPLES, alpha: float = L2_EWMA_ALPHA):
+        self.capacity = capacity
+        self.alpha = alpha
+        self._timestamps = np.zeros(capacity, dtype=np.float64)
+        self._tps = np.zeros(capacity, dtype=np.float64)
+        self._gas = np.zeros(capacity, dtype=np.int64)
+        self._next = 0
+        self._size = 0
+        self.ewma_tps: Optional[float] = None
+        self.peak_tps: float = 0.0
+        self.peak_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def record(self, timestamp: float, tps: float, gas: int):
+        self._timestamps[self._next] = timestamp
+        self._tps[self._next] = tps
+        self._gas[self._next] = gas
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+        if self.ewma_tps is None:
+            self.ewma_tps = tps
+        else:
+            self.ewma_tps += self.alpha * (tps - self.ewma_tps)
+        if self.peak_at is None or tps > self.peak_tps:
+            self.peak_tps = tps
+            self.peak_at = timestamp
+
+    def get_arrays(self, since: float = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get samples taken at or after `since` as (timestamps, tps, gas), oldest first"""
+        start = (self._next - self._size) % self.capacity
+        indexes = (start + np.arange(self._size)) % self.capacity
+        timestamps = self._timestamps[indexes]
+        # Samples are appended in time order, so the window is a suffix
+        first = int(np.searchsorted(timestamps, since, side='left'))
+        indexes = indexes[first:]
+        return timestamps[first:], self._tps[indexes], self._gas[indexes]
+
+    def get_stats(self, window: float, points: int = 0, now: Optional[float] = None) -> Dict:
+        """Smoothed, average and peak TPS over the last `window` seconds, plus an
+        optional TPS trend bucketed into `points` averages"""
+        now = time.time() if now is None else now
+        timestamps, tps, gas = self.get_arrays(now - window)
+        stats = {
+            "tps_ewma": round(self.ewma_tps, 2) if self.ewma_tps is not None else None,
+            "samples": int(len(tps)),
+            "all_time_peak_tps": round(self.peak_tps, 2)
+        }
+        if len(tps):
+            peak = int(np.argmax(tps))
+            stats.update({
+                "avg_tps": round(float(tps.mean()), 2),
+                "peak_tps": round(float(tps[peak]), 2),
+                "peak_at": float(timestamps[peak]),
+                "avg_gas": int(gas.mean())
+            })
+            if points > 0:
+                stats["trend"] = [
+                    {
+                        "timestamp": float(timestamps[bucket[-1]]),
+                        "tps": round(float(tps[bucket].mean()), 2)
+                    }
+                    for bucket in np.array_split(np.arange(len(tps)), min(points, len(tps)))
+                ]
+        return stats
+
 class L2MetricsTracker:
-    def __init__(self):
+    def __init__(self, history_samples: int = DEFAULT_L2_HISTORY_SAMPLES,
+                 max_history_chains: int = MAX_L2_HISTORY_CHAINS):
         self.metrics: Dict[str, L2Metrics] = {}
         self.total_tps: float = 0
         self.total_gas: int = 0
+        # All chains sorted by TPS, rebuilt only after a TPS change
+        self._sorted_l2s: Optional[List[L2Metrics]] = None
+        # Per-chain sample history, least recently updated first
+        self.history: "OrderedDict[str, L2ChainHistory]" = OrderedDict()
+        self.history_samples = history_samples
+        self.max_history_chains = max_history_chains
         self._session: Optional[aiohttp.ClientSession] = None
+        self._stream_task: Optional[asyncio.Task] = None
         self._is_connected: bool = False
+        # Full-rate streaming while active, short keep-warm connections otherwise
+        self.active = True
+        self._activated: Optional[asyncio.Event] = None
+        # Stream counters
+        self.events_total = 0
+        self.reconnects = 0
+        self.events_per_second = 0.0
+        self._last_event_at: Optional[float] = None
+        self._rate_window_start = time.monotonic()
+        self._rate_window_events = 0
+        self._last_expiry_check = 0.0
 
     async def start(self):
         if self._session:
@@ -31,26 +147,122 @@ class L2MetricsTracker:
             
         logger.info("Starting L2 metrics tracker")
         self._session = aiohttp.ClientSession()
-        asyncio.create_task(self._stream_metrics())
+        self._activated = asyncio.Event()
+        self._stream_task = asyncio.create_task(self._stream_metrics())
+
+    def set_active(self, active: bool):
+        """Stream continuously while active, otherwise only keep the data warm"""
+        if active == self.active:
+            return
+        self.active = active
+        logger.info(f"L2 metrics stream {'active' if active else 'in keep-warm mode'}")
+        if active and self._activated:
+            self._activated.set()
 
     async def stop(self):
         if self._session:
             logger.info("Stopping L2 metrics tracker")
+            if self._stream_task:
+                self._stream_task.cancel()
+                self._stream_task = None
             await self._session.close()
             self._session = None
             self._is_connected = False
 
     def get_top_l2s(self, count: int = 10) -> List[L2Metrics]:
-        sorted_l2s = sorted(
-            self.metrics.values(),
-            key=lambda x: x.tps,
-            reverse=True
-        )
-        return sorted_l2s[:count]
+        self._expire_stale_chains()
+        if self._sorted_l2s is None:
+            self._sorted_l2s = sorted(
+                self.metrics.values(),
+                key=lambda x: x.tps,
+                reverse=True
+            )
+        return self._sorted_l2s[:count]
+
+    def get_history_stats(self, chain_name: str, window: float, points: int = 0) -> Optional[Dict]:
+        history = self.history.get(chain_name)
+        if history is None:
+            return None
+        return history.get_stats(window, points)
+
+    def get_total_tps_ewma(self) -> float:
+        return sum(h.ewma_tps for h in self.history.values() if h.ewma_tps is not None)
 
     def get_connection_status(self) -> bool:
         return self._is_connected
 
+    def get_last_event_age(self) -> Optional[float]:
+        """Seconds since the last event was received, None if none has been"""
+        if self._last_event_at is None:
+            return None
+        return time.monotonic() - self._last_event_at
+
+    def _freshness_limit(self) -> float:
+        """Seconds without events before the data counts as stale"""
+        if self.active:
+            return L2_STREAM_IDLE_TIMEOUT
+        return L2_KEEP_WARM_INTERVAL + L2_KEEP_WARM_DURATION + L2_STREAM_IDLE_TIMEOUT
+
+    def has_fresh_data(self) -> bool:
+        """Whether the stream is connected (or keeping warm), recently active and has unexpired chains"""
+        age = self.get_last_event_age()
+        if age is None or age > self._freshness_limit():
+            return False
+        if self.active and not self._is_connected:
+            return False
+        self._expire_stale_chains()
+        return bool(self.metrics)
+
+    def get_stream_stats(self) -> Dict:
+        age = self.get_last_event_age()
+        return {
+            "connected": self._is_connected,
+            "active": self.active,
+            "fresh": self.has_fresh_data(),
+            "events_total": self.events_total,
+            "events_per_second": round(self.events_per_second, 2),
+            "reconnects": self.reconnects,
+            "last_event_age": round(age, 1) if age is not None else None,
+            "chains": len(self.metrics)
+        }
+
+    def _expire_stale_chains(self):
+        """Drop chains whose last update is older than L2_CHAIN_EXPIRY (checked at most once a second)"""
+        now = time.monotonic()
+        if now - self._last_expiry_check < 1:
+            return
+        self._last_expiry_check = now
+
+        cutoff = datetime.now() - max(L2_CHAIN_EXPIRY, timedelta(seconds=self._freshness_limit()))
+        for chain_name in [name for name, m in self.metrics.items() if m.last_updated < cutoff]:
+            metrics = self.metrics.pop(chain_name)
+            # Its frozen EWMA and peaks would otherwise keep counting towards the totals
+            self.history.pop(chain_name, None)
+            self.total_tps -= metrics.tps
+            self.total_gas -= metrics.gas_used
+            self._sorted_l2s = None
+            logger.info(f"Expired stale L2 metrics for {chain_name}")
+        if not self.metrics:
+            # Reset rather than keep accumulated float error
+            self.total_tps = 0
+            self.total_gas = 0
+
+    def _reconnect_delay(self, failures: int) -> float:
+        """Exponential backoff, jittered between half and the full delay"""
+        delay = min(L2_RECONNECT_MAX_DELAY, L2_RECONNECT_BASE_DELAY * 2 ** failures)
+        return random.uniform(delay / 2, delay)
+
+    def _count_event(self):
+        now = time.monotonic()
+        self.events_total += 1
+        self._last_event_at = now
+        self._rate_window_events += 1
+        elapsed = now - self._rate_window_start
+        if elapsed >= L2_EVENT_RATE_WINDOW:
+            self.events_per_second = self._rate_window_events / elapsed
+            self._rate_window_start = now
+            self._rate_window_events = 0
+
     async def _stream_metrics(self):
         headers = {
             'accept': 'text/event-stream',
@@ -67,54 +279,113 @@ class L2MetricsTracker:
             'user-agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36'
         }
 
+        # Fail the read if no bytes arrive for a while, so a silently stalled
+        # stream is reconnected instead of serving frozen numbers
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=L2_STREAM_IDLE_TIMEOUT)
+        failures = 0
+
         while True:
+            keep_warm_done = False
             try:
                 logger.info("Connecting to L2 metrics stream...")
                 async with self._session.get(
                     'https://tracker-api-gdesfolyga-uw.a.run.app/sse',
-                    headers=headers
+                    headers=headers,
+                    timeout=timeout
                 ) as response:
                     if response.status == 200:
                         logger.info("Connected to L2 metrics stream")
                         self._is_connected = True
+                        connected_at = time.monotonic()
                         
+                        chain_name = None
                         async for line in response.content:
+                            if not self.active and time.monotonic() - connected_at > L2_KEEP_WARM_DURATION:
+                                keep_warm_done = True
+                                break
                             line = line.decode('utf-8').strip()
                             if line.startswith('event:'):
                                 chain_name = line[6:].strip()
-                            elif line.startswith('data:'):
+                            elif line.startswith('data:') and chain_name:
                                 data = json.loads(line[5:])
+                                self._count_event()
                                 self._process_metrics(chain_name, data)
+                                failures = 0
+                        if not keep_warm_done:
+                            logger.warning("L2 metrics stream closed by server")
                     else:
                         logger.error(f"Failed to connect to L2 metrics stream: {response.status}")
-                        self._is_connected = False
                         
+            except asyncio.CancelledError:
+                self._is_connected = False
+                raise
+            except asyncio.TimeoutError:
+                logger.warning(f"L2 metrics stream idle for {L2_STREAM_IDLE_TIMEOUT}s, reconnecting")
             except aiohttp.ClientError as e:
                 logger.error(f"Connection error in L2 metrics stream: {e}")
-                self._is_connected = False
             except Exception as e:
                 logger.error(f"Unexpected error in L2 metrics stream: {e}")
-                self._is_connected = False
             
-            # Wait before reconnecting
-            await asyncio.sleep(30)
+            self._is_connected = False
+            if keep_warm_done:
+                await self._wait_for_activation(L2_KEEP_WARM_INTERVAL)
+                continue
+
+            delay = self._reconnect_delay(failures)
+            failures += 1
+            self.reconnects += 1
+            logger.info(f"Reconnecting to L2 metrics stream in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def _wait_for_activation(self, timeout: float):
+        """Sleep until the keep-warm interval has passed or the view becomes active"""
+        self._activated.clear()
+        if self.active:
+            return
+        try:
+            await asyncio.wait_for(self._activated.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
 
     def _process_metrics(self, chain_name: str, data: Dict):
         try:
             tps = float(data.get('tps', 0))
             gas = int(data.get('gasCount', 0))
             
-            self.metrics[chain_name] = L2Metrics(
-                name=chain_name,
-                tps=tps,
-                gas_used=gas,
-                last_updated=datetime.now()
-            )
-            
-            # Recalculate totals
-            self.total_tps = sum(m.tps for m in self.metrics.values())
-            self.total_gas = sum(m.gas_used for m in self.metrics.values())
+            metrics = self.metrics.get(chain_name)
+            if metrics is None:
+                self.metrics[chain_name] = L2Metrics(
+                    name=chain_name,
+                    tps=tps,
+                    gas_used=gas,
+                    last_updated=datetime.now()
+                )
+                self.total_tps += tps
+                self.total_gas += gas
+                self._sorted_l2s = None
+            else:
+                # Update totals by the change instead of summing every chain
+                self.total_tps += tps - metrics.tps
+                self.total_gas += gas - metrics.gas_used
+                if tps != metrics.tps:
+                    self._sorted_l2s = None
+                metrics.tps = tps
+                metrics.gas_used = gas
+                metrics.last_updated = datetime.now()
+
+            self._record_history(chain_name, tps, gas)
             
             logger.debug(f"Updated metrics for {chain_name}. Total TPS: {self.total_tps:.2f}, Total Gas: {self.total_gas}")
         except Exception as e:
-            logger.error(f"Error processing L2 metrics for {chain_name}: {e}")
\ No newline at end of file
+            logger.error(f"Error processing L2 metrics for {chain_name}: {e}")
+
+    def _record_history(self, chain_name: str, tps: float, gas: int):
+        history = self.history.get(chain_name)
+        if history is None:
+            history = self.history[chain_name] = L2ChainHistory(self.history_samples)
+            if len(self.history) > self.max_history_chains:
+                evicted, _ = self.history.popitem(last=False)
+                logger.debug(f"Dropped L2 history for {evicted}")
+        else:
+            self.history.move_to_end(chain_name)
+        history.record(time.time(), tps, gas)
\ No newline at end of file
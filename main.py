@@ -1,15 +1,15 @@
 import os
 import asyncio
+import time
 from beacon_client import BeaconClient
 from divoom_client import DivoomClient
 from slot_client import SlotClient
-from fastapi import FastAPI, Response, Body
+from fastapi import FastAPI, HTTPException, Response, Body, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import httpx
 import uvicorn
 from dotenv import load_dotenv
-from playwright.async_api import async_playwright
 from typing import Dict
 from validator_gadget import ValidatorGadget
 import requests
@@ -23,10 +23,14 @@ from PIL import Image, ImageTk
 from datetime import datetime, timedelta
 import aiohttp
 import json
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional
+from dataclasses import asdict, dataclass
 from l2_metrics import L2MetricsTracker
 from defillama_client import DeFiLlamaClient
+from slot_store import SlotStore
+from display_scheduler import DisplayScheduler
+from display_registry import Display, DisplayRegistry
+from render_pool import MINIMAL_LAUNCH_ARGS, RenderPool, RenderRouter
 
 logging.basicConfig(
     level=logging.INFO,
@@ -46,15 +50,43 @@ PORT = int(os.getenv('PORT', '8000'))
 MODE = os.getenv('MODE', 'production')
 REACT_DEV_SERVER = "http://localhost:5173" if MODE == 'development' else None
 VIEW_INTERVAL_MINUTES = int(os.getenv('VIEW_INTERVAL_MINUTES', '10'))
+# Relative share of rotation slots per view, e.g. "mev:2,overview:2" (default 1)
+VIEW_WEIGHTS = {}
+for entry in filter(None, (entry.strip() for entry in os.getenv('VIEW_WEIGHTS', '').split(','))):
+    name, _, weight = entry.partition(':')
+    if not weight.strip().isdigit() or int(weight) < 1:
+        raise ValueError(f"Invalid VIEW_WEIGHTS entry '{entry}': expected <view>:<positive integer>")
+    VIEW_WEIGHTS[name.strip()] = int(weight)
+# Seconds before a rotation that the next view's data is warmed
+VIEW_PREWARM_SECONDS = 30
+# Views backed by the beacon node's event stream, lab slot data and the L2 stream
+BEACON_VIEWS = {"overview", "execution", "proposer", "mev"}
+LAB_VIEWS = {"mev"}
+L2_VIEWS = {"layer2"}
 DIVOOM_REQUEST_INTERVAL_SECONDS = int(os.getenv('DIVOOM_REQUEST_INTERVAL_SECONDS', '30'))
+STATE_DB_PATH = os.getenv('STATE_DB_PATH', 'beacon_state.db')
+DEFILLAMA_CACHE_DIR = os.getenv('DEFILLAMA_CACHE_DIR', 'defillama_cache')
+SLOT_DATA_HEAD_DELAY_SECONDS = float(os.getenv('SLOT_DATA_HEAD_DELAY_SECONDS', '4'))
+# Headless Chromium pages rendering views concurrently, and their limits
+RENDER_POOL_SIZE = int(os.getenv('RENDER_POOL_SIZE', '2'))
+RENDER_TIMEOUT_SECONDS = float(os.getenv('RENDER_TIMEOUT_SECONDS', '10'))
+RENDER_PAGE_MAX_RENDERS = int(os.getenv('RENDER_PAGE_MAX_RENDERS', '200'))
+# "minimal" trims Chromium and serves render pages from memory; "standard" is the plain browser
+RENDER_PROFILE = os.getenv('RENDER_PROFILE', 'minimal')
+# Several displays as a JSON list of {"name", "endpoint", "views", "interval_minutes",
+# "request_interval_seconds"}; defaults to one display at DIVOOM_API_ENDPOINT
+DISPLAYS_CONFIG = json.loads(os.getenv('DISPLAYS', '[]'))
 
 # Validate configuration
 if not BEACON_NODE_URL:
     raise ValueError("BEACON_NODE_URL environment variable is required")
 if not VALIDATOR_INDEXES or VALIDATOR_INDEXES == ['']:
     raise ValueError("VALIDATOR_INDEXES environment variable is required")
-if not DIVOOM_API_ENDPOINT:
-    raise ValueError("DIVOOM_API_ENDPOINT environment variable is required")
+if not DIVOOM_API_ENDPOINT and not DISPLAYS_CONFIG:
+    raise ValueError("DIVOOM_API_ENDPOINT or DISPLAYS environment variable is required")
+for display_config in DISPLAYS_CONFIG:
+    if not display_config.get('endpoint'):
+        raise ValueError(f"Display without an endpoint in DISPLAYS: {display_config}")
 
 @dataclass
 class View:
@@ -63,76 +95,159 @@ class View:
     needs_refresh: bool  # If True, remount component on refresh
     refresh_interval: float  # In seconds, 0 means no refresh
     description: Optional[str] = None
+    weight: int = 1  # Relative share of rotation slots
 
 ENABLED_VIEWS = os.getenv('ENABLED_VIEWS', 'proposer,overview,execution,layer2,mev,defi-tvl,defi-yields,defi-volume').split(',')
+# Every view shown on any display; ENABLED_VIEWS stays the default for displays without "views"
+DISPLAYED_VIEWS = (
+    {view for config in DISPLAYS_CONFIG for view in config.get('views', ENABLED_VIEWS)}
+    if DISPLAYS_CONFIG else set(ENABLED_VIEWS)
+)
 
 VIEWS = {
     "proposer": View(
         name="proposer",
-        enabled="proposer" in ENABLED_VIEWS,
+        enabled="proposer" in DISPLAYED_VIEWS,
         needs_refresh=False,
         refresh_interval=4,  # Refresh every slot
         description="Shows upcoming block proposers"
     ),
     "overview": View(
         name="overview", 
-        enabled="overview" in ENABLED_VIEWS,
+        enabled="overview" in DISPLAYED_VIEWS,
         needs_refresh=False,
         refresh_interval=4,
         description="Validator performance overview"
     ),
     "execution": View(
         name="execution",
-        enabled="execution" in ENABLED_VIEWS,
+        enabled="execution" in DISPLAYED_VIEWS,
         needs_refresh=False, 
         refresh_interval=4,
         description="Execution layer metrics"
     ),
     "layer2": View(
         name="layer2",
-        enabled="layer2" in ENABLED_VIEWS,
+        enabled="layer2" in DISPLAYED_VIEWS,
         needs_refresh=True,
         refresh_interval=0.1,
         description="Layer 2 metrics"
     ),
     "mev": View(
         name="mev",
-        enabled="mev" in ENABLED_VIEWS,
+        enabled="mev" in DISPLAYED_VIEWS,
         needs_refresh=False,
         refresh_interval=4,  # Refresh every slot
         description="MEV data from ethpandaops lab"
     ),
     "defi-tvl": View(
         name="defi-tvl",
-        enabled="defi-tvl" in ENABLED_VIEWS,
+        enabled="defi-tvl" in DISPLAYED_VIEWS,
         needs_refresh=False,
         refresh_interval=60,  # 1 minute
         description="DeFi protocols TVL overview"
     ),
     "defi-yields": View(
         name="defi-yields",
-        enabled="defi-yields" in ENABLED_VIEWS,
+        enabled="defi-yields" in DISPLAYED_VIEWS,
         needs_refresh=False,
         refresh_interval=120,  # 2 minutes
         description="DeFi yield opportunities"
     ),
     "defi-volume": View(
         name="defi-volume",
-        enabled="defi-volume" in ENABLED_VIEWS,
+        enabled="defi-volume" in DISPLAYED_VIEWS,
         needs_refresh=False,
         refresh_interval=90,  # 1.5 minutes
         description="DEX volume and activity"
     )
 }
 
+def weighted_schedule(weights: Dict[str, int]) -> List[str]:
+    """Deterministic rotation order giving each view `weight` slots per cycle,
+    spread out using smooth weighted round-robin"""
+    current = {name: 0 for name in weights}
+    total = sum(weights.values())
+    schedule = []
+    for _ in range(total):
+        for name, weight in weights.items():
+            current[name] += weight
+        chosen = max(current, key=current.get)
+        current[chosen] -= total
+        schedule.append(chosen)
+    return schedule
+
 class ViewRotation:
-    def __init__(self, views: Dict[str, View], interval_minutes: int):
+    def __init__(
+        self,
+        views: Dict[str, View],
+        interval_minutes: int,
+        data_checks: Optional[Dict[str, Callable[[], bool]]] = None,
+        warmers: Optional[Dict[str, Callable[[], Awaitable]]] = None
+    ):
         self.views = {k: v for k, v in views.items() if v.enabled}
         self.interval_minutes = interval_minutes
+        # View name -> whether its backing data is available and fresh
+        self.data_checks = data_checks or {}
+        # View name -> coroutine function fetching its data ahead of a switch
+        self.warmers = {k: v for k, v in (warmers or {}).items() if k in self.views}
+        self.schedule = weighted_schedule({name: view.weight for name, view in self.views.items()})
+        self._schedule_index = -1
         self.last_view = None
         self.last_change_time = datetime.now() - timedelta(minutes=interval_minutes)
         self.override_view = None
         self.override_until = None
+        self.skipped: Dict[str, int] = {}
+
+    def is_view_available(self, view_name: str) -> bool:
+        check = self.data_checks.get(view_name)
+        try:
+            return check() if check else True
+        except Exception as e:
+            logging.error(f"Error checking data for view {view_name}: {e}")
+            return False
+
+    def seconds_until_switch(self) -> float:
+        if self.override_view and self.override_until:
+            return (self.override_until - datetime.now()).total_seconds()
+        switch_at = self.last_change_time + timedelta(minutes=self.interval_minutes)
+        return (switch_at - datetime.now()).total_seconds()
+
+    def get_wanted_views(self, lead_seconds: float = VIEW_PREWARM_SECONDS) -> set:
+        """The shown view, plus the next one when a switch is close"""
+        current = self.get_current_view()
+        wanted = {current.name} if current else set()
+        if self.seconds_until_switch() <= lead_seconds:
+            wanted.add(self.upcoming_view())
+        return wanted
+
+    def upcoming_view(self) -> Optional[str]:
+        """View shown after the next switch, including views only missing data.
+
+        When an override ends, the scheduled view returns, or the view after
+        it if its interval has run out by then.
+        """
+        if self.override_view and self.override_until:
+            shown_for = (self.override_until - self.last_change_time).total_seconds()
+            if self.last_view and shown_for < self.interval_minutes * 60:
+                return self.last_view
+        return self.peek_next_view(require_data=False)
+
+    def peek_next_view(self, require_data: bool = True) -> Optional[str]:
+        """Next view in the schedule, skipping the current view and, when
+        `require_data`, views without data"""
+        return self._find_next(require_data)[0]
+
+    def _find_next(self, require_data: bool):
+        for offset in range(1, len(self.schedule) + 1):
+            index = (self._schedule_index + offset) % len(self.schedule)
+            name = self.schedule[index]
+            if name == self.last_view and len(self.views) > 1:
+                continue
+            if require_data and not self.is_view_available(name):
+                continue
+            return name, index
+        return None, self._schedule_index
 
     def get_current_view(self) -> Optional[View]:
         now = datetime.now()
@@ -143,125 +258,153 @@ class ViewRotation:
             self.override_view = None
             self.override_until = None
         
-        if (now - self.last_change_time).total_seconds() >= self.interval_minutes * 60:
-            available_views = [name for name in self.views.keys() if name != self.last_view]
-            if not available_views:
-                available_views = list(self.views.keys())
-            
-            import random
-            self.last_view = random.choice(available_views)
-            self.last_change_time = now
+        due = (now - self.last_change_time).total_seconds() >= self.interval_minutes * 60
+        # Leave a view early once its data is gone instead of showing it empty
+        if due or (self.last_view and not self.is_view_available(self.last_view)):
+            name, index = self._find_next(require_data=True)
+            if name is not None and name != self.last_view:
+                for skipped in self._skipped_between(index):
+                    self.skipped[skipped] = self.skipped.get(skipped, 0) + 1
+                self._schedule_index = index
+                self.last_view = name
+                self.last_change_time = now
+            elif self.last_view is None and self.schedule:
+                # Nothing has data yet: show the first view rather than nothing
+                self._schedule_index = 0
+                self.last_view = self.schedule[0]
+                self.last_change_time = now
+            elif due:
+                self.last_change_time = now
             
         return self.views.get(self.last_view)
 
+    def _skipped_between(self, index: int) -> List[str]:
+        skipped = []
+        position = (self._schedule_index + 1) % len(self.schedule)
+        while position != index:
+            if self.schedule[position] != self.last_view:
+                skipped.append(self.schedule[position])
+            position = (position + 1) % len(self.schedule)
+        return skipped
+
     def set_override(self, view: str, duration_minutes: int):
         if view != "none" and view not in self.views:
             raise ValueError(f"Invalid view: {view}")
-        
+
         self.override_view = view if view != "none" else None
         self.override_until = datetime.now() + timedelta(minutes=duration_minutes) if view != "none" else None
 
     def get_view_config(self, view_name: str) -> Optional[View]:
         return self.views.get(view_name)
 
+    async def run_prewarm(self, lead_seconds: float = VIEW_PREWARM_SECONDS):
+        """Warm the next view's data shortly before each scheduled switch"""
+        while True:
+            switch_at = self.last_change_time + timedelta(minutes=self.interval_minutes)
+            wait = (switch_at - datetime.now()).total_seconds() - lead_seconds
+            await asyncio.sleep(max(wait, 1))
+            if (switch_at - datetime.now()).total_seconds() > lead_seconds:
+                continue  # The view changed early; recompute the next switch
+
+            # Also warm views that are only missing data, so they can be shown
+            name = self.upcoming_view()
+            warmer = self.warmers.get(name)
+            if warmer:
+                try:
+                    logging.info(f"Warming data for next view {name}")
+                    await warmer()
+                except Exception as e:
+                    logging.error(f"Error warming data for view {name}: {e}")
+            await asyncio.sleep(lead_seconds)
+
 # Add to the global variables
 l2_tracker = L2MetricsTracker()
 slot_client = SlotClient()
-screenshot_cache = None
-browser_lock = asyncio.Lock()
-playwright = None
-browser = None
-context = None
-page = None
-
-async def initialize_browser():
-    global playwright, browser, context, page
-    
-    try:
-        playwright = await async_playwright().start()
-        browser = await playwright.chromium.launch(
-            args=['--no-sandbox', '--disable-dev-shm-usage']
-        )
-        
-        context = await browser.new_context(
-            viewport={'width': 64, 'height': 64},
-            device_scale_factor=1,
+# View name -> (png, time the screenshot started), rendered once for all displays
+frame_cache: Dict[str, tuple] = {}
+frame_updated = asyncio.Event()
+# In-process client for API requests of render pages; created on first use since `app` is defined later
+render_api_client: Optional[httpx.AsyncClient] = None
+
+async def fetch_api_in_process(path: str):
+    """Call an API endpoint through the ASGI app directly, without a loopback HTTP request"""
+    global render_api_client
+    if render_api_client is None:
+        render_api_client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url=f"http://localhost:{PORT}"
         )
-        
-        page = await context.new_page()
-        
-        # Anti-aliasing prevention
-        await page.add_init_script("""
-            document.addEventListener('DOMContentLoaded', () => {
-                const style = document.createElement('style');
-                style.textContent = `
-                    * {
-                        image-rendering: pixelated !important;
-                        -webkit-font-smoothing: none !important;
-                        -moz-osx-font-smoothing: none !important;
-                        font-smoothing: none !important;
-                        text-rendering: optimizeSpeed !important;
-                        transform: translate3d(0, 0, 0);
-                        backface-visibility: hidden;
-                    }
-                `;
-                document.head.appendChild(style);
-            });
-        """)
-        
-    except Exception as e:
-        logging.error(f"Failed to initialize browser: {e}")
-        await cleanup_browser()
-        raise
+    response = await render_api_client.get(path)
+    return response.status_code, response.headers.get('content-type', 'application/json'), response.content
 
-async def cleanup_browser():
-    global playwright, browser, context, page
-    
-    if page:
-        await page.close()
-    if context:
-        await context.close()
-    if browser:
-        await browser.close()
-    if playwright:
-        await playwright.stop()
-        
-    page = None
-    context = None
-    browser = None
-    playwright = None
+def build_render_pool() -> RenderPool:
+    if RENDER_PROFILE != 'minimal':
+        return RenderPool(RENDER_POOL_SIZE, RENDER_TIMEOUT_SECONDS, RENDER_PAGE_MAX_RENDERS)
+    router = RenderRouter(
+        f"http://localhost:{PORT}",
+        fetch_api_in_process,
+        # The dev server bundle is fetched as usual; the production bundle is served from memory
+        static_dir=REACT_APP_PATH if MODE != 'development' else None,
+        blocked_paths=("/api/image",)
+    )
+    return RenderPool(
+        RENDER_POOL_SIZE,
+        RENDER_TIMEOUT_SECONDS,
+        RENDER_PAGE_MAX_RENDERS,
+        launch_args=MINIMAL_LAUNCH_ARGS,
+        router=router
+    )
+
+render_pool = build_render_pool()
 
 async def update_screenshot_cache():
-    global screenshot_cache, page
-    
     while True:
         try:
-            if not page:
-                await initialize_browser()
+            if not render_pool.running:
+                await render_pool.start()
                 
-            url = f"http://localhost:{PORT}"
-            await page.goto(url)
-            await page.wait_for_timeout(500)
-            
-            async with browser_lock:
-                screenshot_cache = await page.screenshot(
-                    type='png',
-                    omit_background=False,
-                    scale='css',
-                    animations='disabled',
-                )
+            # Render each view shown (or about to be) on any display once,
+            # concurrently up to the pool size
+            await asyncio.gather(*(render_view(name) for name in display_registry.wanted_views()))
             
             await asyncio.sleep(1)
             
         except Exception as e:
             logging.error(f"Screenshot error: {e}")
-            await cleanup_browser()
+            await render_pool.stop()
             await asyncio.sleep(1)  # Wait before retrying
 
-# Replace capture_react_page with this simpler version
-async def capture_react_page():
-    async with browser_lock:
-        return screenshot_cache
+async def render_view(view_name: str):
+    frame = await render_pool.render(f"http://localhost:{PORT}/views/{view_name}")
+    if frame is None:
+        return
+    
+    screenshot, captured_at = frame
+    previous = frame_cache.get(view_name)
+    frame_cache[view_name] = frame
+    frame_updated.set()
+    frame_updated.clear()
+    if previous is None or previous[0] != screenshot:
+        display_registry.trigger_view(view_name, "frame")
+
+async def capture_react_page(view_name: Optional[str] = None):
+    """Newest frame of a view, by default the first display's current view"""
+    if view_name is None:
+        view_name = display_registry.get().current_view_name()
+    frame = frame_cache.get(view_name)
+    return frame[0] if frame else None
+
+async def capture_view_since(view_name: Optional[str], since: float, timeout: float) -> Optional[bytes]:
+    """Wait for a frame of a view started after `since` (up to `timeout`), falling back to the newest one"""
+    if view_name is None:
+        return None
+    deadline = time.time() + timeout
+    while frame_cache.get(view_name, (None, 0.0))[1] < since and time.time() < deadline:
+        try:
+            await asyncio.wait_for(frame_updated.wait(), timeout=deadline - time.time())
+        except asyncio.TimeoutError:
+            break
+    return await capture_react_page(view_name)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -272,37 +415,68 @@ async def lifespan(app: FastAPI):
     global validator_gadget
     validator_gadget = ValidatorGadget()
     
-    # Initialize beacon client
+    # Open the persistent slot store and initialize beacon client from it
+    slot_store.open()
     await beacon_client.initialize()
+    store_flusher = asyncio.create_task(slot_store.run_flusher(beacon_client.get_store_retention))
     
     # Add event listeners
     beacon_client.add_head_listener(handle_head_event)
     beacon_client.add_slot_listener(handle_slot_change)
     
-    # Start background tasks
-    asyncio.create_task(beacon_client.subscribe_to_head_events())
-    asyncio.create_task(beacon_client.start_slot_timer())
-    asyncio.create_task(load_historical_blocks())
-    print("Started SSE subscription and slot timer")
+    # Start background tasks, only for data sources an enabled view uses
+    enabled_views = display_registry.enabled_views()
+    if enabled_views & BEACON_VIEWS:
+        asyncio.create_task(beacon_client.subscribe_to_head_events())
+        asyncio.create_task(beacon_client.start_slot_timer())
+        asyncio.create_task(beacon_client.run_duties_scheduler())
+        asyncio.create_task(load_historical_blocks())
+        print("Started SSE subscription and slot timer")
     
     # Start L2 tracker
-    await l2_tracker.start()
+    if enabled_views & L2_VIEWS:
+        await l2_tracker.start()
 
     # Initialize slot client and start background fetch
-    await slot_client.start()
-    print("Initialized slot client")
+    if enabled_views & LAB_VIEWS:
+        if SLOT_DATA_HEAD_DELAY_SECONDS >= 0:
+            slot_client.attach_to_beacon(beacon_client, SLOT_DATA_HEAD_DELAY_SECONDS)
+        await slot_client.start(
+            int(beacon_client.get_slot_start_time(0)),
+            int(beacon_client.config['data']['SECONDS_PER_SLOT'])
+        )
+        print("Initialized slot client")
+    asyncio.create_task(manage_data_sources())
 
-    # Start display update task
-    asyncio.create_task(update_display())
+    # Start the displays and warm the data of their views
+    display_registry.start()
+    for view_name, warmer in VIEW_WARMERS.items():
+        if view_name in enabled_views:
+            asyncio.create_task(warmer())
 
     # Start screenshot cache update task
-    asyncio.create_task(update_screenshot_cache())
+    screenshot_task = asyncio.create_task(update_screenshot_cache())
 
     yield  # Server is running
 
     # Cleanup
     print("Shutting down...")
-    await cleanup_browser()
+    await display_registry.stop()
+    screenshot_task.cancel()
+    try:
+        await screenshot_task
+    except asyncio.CancelledError:
+        pass
+    await render_pool.stop()
+    if render_api_client:
+        await render_api_client.aclose()
+    await beacon_client.close()
+    store_flusher.cancel()
+    try:
+        await store_flusher
+    except asyncio.CancelledError:
+        pass
+    slot_store.close()  # Flushes pending writes
     await l2_tracker.stop()
     await slot_client.stop()
     await defillama_client.close()
@@ -318,26 +492,84 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-beacon_client = BeaconClient(BEACON_NODE_URL, VALIDATOR_INDEXES)
-divoom_client = DivoomClient(DIVOOM_API_ENDPOINT, DIVOOM_REQUEST_INTERVAL_SECONDS)
+slot_store = SlotStore(STATE_DB_PATH)
+beacon_client = BeaconClient(BEACON_NODE_URL, VALIDATOR_INDEXES, slot_store)
 validator_gadget = ValidatorGadget()
-defillama_client = DeFiLlamaClient()
-view_rotation = ViewRotation(VIEWS, VIEW_INTERVAL_MINUTES)
+defillama_client = DeFiLlamaClient(DEFILLAMA_CACHE_DIR)
+
+def slot_data_is_fresh() -> bool:
+    return bool(slot_client.latest_slot_data) and time.time() - slot_client.last_update_time < 300
+
+def defillama_is_fresh(view_name: str) -> bool:
+    age = defillama_client.get_data_age(view_name)
+    return age is not None and age < 3600
+
+for view_name, weight in VIEW_WEIGHTS.items():
+    if view_name in VIEWS:
+        VIEWS[view_name].weight = weight
 
-async def update_display():
+VIEW_DATA_CHECKS = {
+    "layer2": l2_tracker.has_fresh_data,
+    "mev": slot_data_is_fresh,
+    "defi-tvl": lambda: defillama_is_fresh("protocols_eth"),
+    "defi-yields": lambda: defillama_is_fresh("yields_eth"),
+    "defi-volume": lambda: defillama_is_fresh("volumes_eth"),
+}
+VIEW_WARMERS = {
+    "defi-tvl": defillama_client.get_ethereum_protocols,
+    "defi-yields": defillama_client.get_top_yields,
+    "defi-volume": defillama_client.get_dex_volumes,
+}
+
+def get_slot_timing():
+    """Start and expected block arrival time of the current slot"""
+    slot_start = beacon_client.get_slot_start_time(beacon_client.calculate_current_slot())
+    return slot_start, slot_start + beacon_client.get_expected_arrival_offset()
+
+def build_display_registry() -> DisplayRegistry:
+    """One rotation, rate limit and push scheduler per configured display"""
+    registry = DisplayRegistry()
+    configs = DISPLAYS_CONFIG or [{"name": "default", "endpoint": DIVOOM_API_ENDPOINT}]
+    for config in configs:
+        views = config.get('views', ENABLED_VIEWS)
+        rotation = ViewRotation(
+            {name: view for name, view in VIEWS.items() if name in views},
+            config.get('interval_minutes', VIEW_INTERVAL_MINUTES),
+            data_checks=VIEW_DATA_CHECKS,
+            warmers=VIEW_WARMERS
+        )
+        client = DivoomClient(
+            config['endpoint'],
+            config.get('request_interval_seconds', DIVOOM_REQUEST_INTERVAL_SECONDS)
+        )
+
+        async def capture(since: float, timeout: float, rotation=rotation) -> Optional[bytes]:
+            view = rotation.get_current_view()
+            return await capture_view_since(view.name if view else None, since, timeout)
+
+        scheduler = DisplayScheduler(client, capture, rotation.get_current_view, slot_clock=get_slot_timing)
+        registry.add(Display(config.get('name', config['endpoint']), client, rotation, scheduler))
+    return registry
+
+display_registry = build_display_registry()
+
+def get_display(name: Optional[str]) -> Display:
+    display = display_registry.get(name)
+    if display is None:
+        raise HTTPException(status_code=404, detail=f"Unknown display: {name}")
+    return display
+
+async def manage_data_sources():
+    """Run data sources at full rate only while one of their views is shown or
+    about to be; otherwise they drop to a low-frequency keep-warm mode"""
     while True:
         try:
-            screenshot = await capture_react_page()
-            if screenshot:  # Only update if we have a cached screenshot
-                await divoom_client.update_display(screenshot)
+            wanted = display_registry.wanted_views()
+            l2_tracker.set_active(bool(wanted & L2_VIEWS))
+            slot_client.set_active(bool(wanted & LAB_VIEWS))
         except Exception as e:
-            print(f"Error updating display: {e}")
-        
-        current_view = view_rotation.get_current_view()
-        if current_view:
-            await asyncio.sleep(current_view.refresh_interval)
-        else:
-            await asyncio.sleep(4)  # Default fallback
+            logging.error(f"Error managing data sources: {e}")
+        await asyncio.sleep(5)
 
 def download_validator_mapping():
     """Downloads the validator mapping file if it doesn't exist"""
@@ -365,31 +597,12 @@ def download_validator_mapping():
     logging.info("Validator mapping download complete")
 
 async def handle_head_event(event_data: Dict):
-    """Handle new head events by updating the display and cache"""
-    slot = int(event_data.get('slot', 0))
-
-    # Fetch and cache the new block
-    asyncio.create_task(beacon_client.get_block(slot))
-
-    current_view = view_rotation.get_current_view()
-    if current_view and current_view.name in ["overview", "execution", "proposer", "mev"]:
-        try:
-            screenshot = await capture_react_page()
-            if screenshot:
-                await divoom_client.update_display(screenshot)
-        except Exception as e:
-            print(f"Error updating display on head event: {e}")
+    """Handle new head events by scheduling a display update"""
+    display_registry.trigger_all("head")
 
 async def handle_slot_change(slot_data: Dict):
-    """Handle slot changes by updating the Divoom display"""
-    current_view = view_rotation.get_current_view()
-    if current_view and current_view.name in ["overview", "execution", "proposer", "mev"]:
-        print(f"Re-rendering display for slot {slot_data['slot']} on view {current_view.name}")
-        try:
-            screenshot = await capture_react_page()
-            await divoom_client.update_display(screenshot)
-        except Exception as e:
-            print(f"Error updating display on slot change: {e}")
+    """Handle slot changes by scheduling a display update"""
+    display_registry.trigger_all("slot")
 
 @app.get("/api/status")
 async def get_status():
@@ -400,13 +613,35 @@ async def get_slots():
     return await beacon_client.get_slots(VALIDATOR_INDEXES)
 
 @app.get("/api/arrival-times")
-async def get_arrival_times():
-    return await beacon_client.get_arrival_times()
+async def get_arrival_times(
+    limit: int = Query(16, ge=1, le=7200),
+    window: int = Query(7200, ge=1, le=beacon_client.arrival_history.capacity),
+    late_threshold: float = Query(4.0, gt=0)
+):
+    """Get recent block arrival times plus p50/p90/p99 and late-block rate over `window` slots"""
+    return await beacon_client.get_arrival_times(limit, window, late_threshold)
+
+@app.get("/api/listeners")
+async def get_listener_metrics():
+    """Get queue depth, drop counts and latency for beacon event listeners"""
+    return beacon_client.get_listener_metrics()
+
+@app.get("/api/display/scheduler")
+async def get_display_scheduler_metrics():
+    """Get push counts, push latency and merged/ignored trigger counts of each display's scheduler"""
+    return display_registry.get_metrics()
+
+@app.get("/api/render/pool")
+async def get_render_pool_metrics():
+    """Get render counts, failures, timeouts, recycled pages, render time and browser
+    RSS/CPU per render of the render pool, plus served/blocked requests of render pages"""
+    return {"profile": RENDER_PROFILE, **render_pool.get_metrics()}
 
 @app.get("/api/image")
-async def get_image():
+async def get_image(display: Optional[str] = None):
+    view_name = get_display(display).current_view_name()
     try:
-        screenshot = await capture_react_page()
+        screenshot = await capture_react_page(view_name)
         if not screenshot:
             return Response(
                 content="Screenshot not available",
@@ -506,16 +741,20 @@ async def get_rewards(epoch: int):
         }
 
 @app.get("/api/gas")
-async def get_gas():
-    """Get current gas metrics"""
-    metrics = await beacon_client.get_gas_metrics()
+async def get_gas(
+    window: int = Query(15, ge=1, le=beacon_client.execution_window.capacity),
+    points: int = Query(0, ge=0, le=300)
+):
+    """Get current gas metrics, with totals over `window` slots (300 = 1h, 7200 = 1d)
+    and an optional base fee/utilization trend of `points` buckets"""
+    metrics = await beacon_client.get_gas_metrics(window, points)
     if not metrics:
         return {"error": "Failed to fetch gas metrics"}
     return metrics
 
 @app.get("/api/current-view")
-async def get_current_view():
-    current_view = view_rotation.get_current_view()
+async def get_current_view(display: Optional[str] = None):
+    current_view = get_display(display).rotation.get_current_view()
     return {
         "view": current_view.name if current_view else None,
         "refreshInterval": current_view.refresh_interval if current_view else None,
@@ -523,10 +762,11 @@ async def get_current_view():
     }
 
 @app.get("/api/views/available")
-async def get_available_views():
+async def get_available_views(display: Optional[str] = None):
+    view_rotation = get_display(display).rotation
     available_views = []
     for view_name, view in VIEWS.items():
-        if view.enabled and (view_name != "layer2" or l2_tracker.get_connection_status()):
+        if view_name in view_rotation.views and view_rotation.is_view_available(view_name):
             available_views.append({
                 "name": view_name,
                 "refreshInterval": view.refresh_interval,
@@ -536,6 +776,9 @@ async def get_available_views():
     
     return {
         "views": available_views,
+        "schedule": view_rotation.schedule,
+        "next": view_rotation.peek_next_view(),
+        "skipped": view_rotation.skipped,
         "currentOverride": {
             "view": view_rotation.override_view,
             "until": view_rotation.override_until.isoformat() if view_rotation.override_until else None
@@ -545,28 +788,41 @@ async def get_available_views():
 @app.post("/api/views/override")
 async def set_view_override(
     view: str = Body(..., embed=True),
-    duration_minutes: int = Body(..., embed=True)
+    duration_minutes: int = Body(..., embed=True),
+    display: Optional[str] = Body(None, embed=True)
 ):
+    target = get_display(display)
     try:
-        view_rotation.set_override(view, duration_minutes)
+        target.rotation.set_override(view, duration_minutes)
+        target.scheduler.trigger("view")
         return {"status": "success"}
     except ValueError as e:
         return {"status": "error", "message": str(e)}
 
 @app.get("/api/l2metrics")
-async def get_l2_metrics():
-    top_l2s = l2_tracker.get_top_l2s(5)
+async def get_l2_metrics(
+    count: int = Query(5, ge=1, le=50),
+    window: int = Query(300, ge=1, le=86400),
+    points: int = Query(0, ge=0, le=300)
+):
+    """Get the top L2s by TPS, with smoothed TPS, `window`-second averages and
+    peaks, and an optional TPS trend of `points` buckets per chain"""
+    top_l2s = l2_tracker.get_top_l2s(count)
     return {
         "total_tps": round(l2_tracker.total_tps, 2),
+        "total_tps_ewma": round(l2_tracker.get_total_tps_ewma(), 2),
         "total_gas": l2_tracker.total_gas,
         "top_l2s": [
             {
                 "name": l2.name,
                 "tps": round(l2.tps, 2),
-                "gas_used": l2.gas_used
+                "gas_used": l2.gas_used,
+                **(l2_tracker.get_history_stats(l2.name, window, points) or {})
             } for l2 in top_l2s
         ],
-        "is_connected": l2_tracker.get_connection_status()
+        "window": window,
+        "is_connected": l2_tracker.get_connection_status(),
+        "stream": l2_tracker.get_stream_stats()
     }
 
 @app.get("/api/slot")
@@ -579,95 +835,12 @@ async def get_slot_data():
         if not slot_data:
             return {}  # Return empty object instead of error
 
-        # Extract winning bid
-        winning_bid = None
-        try:
-            block_hash = slot_data.get("block", {}).get("execution_payload_block_hash")
-            relay_bids = slot_data.get("relay_bids", {})
-
-            if block_hash and relay_bids:
-                for relay_name, relay_data in relay_bids.items():
-                    bids = relay_data.get("bids", [])
-                    for bid in bids:
-                        if bid.get("block_hash") == block_hash:
-                            bid["relay_name"] = relay_name
-                            winning_bid = bid
-                            break
-                    if winning_bid:
-                        break
-        except Exception as bid_error:
-            logging.error(f"Error processing relay bids: {bid_error}")
-            winning_bid = None
-
-        # Get arrival times (already extracted in slot_client, but cached here)
-        arrival_times = slot_client._extract_arrival_times(slot_data)
-
-        # Get slot history (already pre-processed from raw payloads)
+        # Summaries and stats are computed once per slot when it is ingested
+        arrival_times = slot_client.latest_summary.get("arrival_times", {})
         slot_history = slot_client.get_slot_history()
-
-        # Generate bid history statistics
-        bid_stats = {}
-        if slot_history and len(slot_history) > 1:
-            try:
-                # Extract bids from history
-                bid_values = []
-                for entry in slot_history:
-                    if entry.get("bid_value"):
-                        try:
-                            wei = int(entry["bid_value"])
-                            eth = wei / 1e18
-                            bid_values.append(eth)
-                        except:
-                            continue
-
-                if bid_values and len(bid_values) > 1:
-                    bid_stats = {
-                        "highest": max(bid_values),
-                        "lowest": min(bid_values),
-                        "average": sum(bid_values) / len(bid_values),
-                        "count": len(bid_values)
-                    }
-
-                    # Calculate trend for bids (positive is increasing, negative is decreasing)
-                    if len(bid_values) >= 3:
-                        recent = bid_values[-3:]
-                        oldest = recent[0]
-                        newest = recent[-2]
-                        bid_stats["trend"] = newest - oldest
-                        bid_stats["trend_pct"] = (newest - oldest) / oldest * 100 if oldest > 0 else 0
-            except Exception as stats_error:
-                logging.error(f"Error calculating bid statistics: {stats_error}")
-
-        # Calculate arrival time history statistics if available
-        arrival_stats = {}
-        if slot_history and len(slot_history) > 1:
-            try:
-                # Extract arrival times from history
-                history_times = []
-                for entry in slot_history:
-                    time_val = entry.get("arrival_times", {}).get("fastest_time")
-                    if time_val is not None:
-                        history_times.append(time_val)
-
-                if history_times:
-                    history_times.sort()
-                    arrival_stats = {
-                        "fastest": min(history_times),
-                        "slowest": max(history_times),
-                        "average": sum(history_times) / len(history_times),
-                        "median": history_times[len(history_times) // 2],
-                        "count": len(history_times)
-                    }
-
-                    # Calculate trend (negative is improving/faster, positive is degrading/slower)
-                    if len(history_times) >= 4:
-                        recent = history_times[-4:]
-                        oldest = recent[0]
-                        newest = recent[-1]
-                        arrival_stats["trend"] = newest - oldest
-                        arrival_stats["trend_pct"] = (newest - oldest) / oldest * 100 if oldest > 0 else 0
-            except Exception as stats_error:
-                logging.error(f"Error calculating arrival statistics: {stats_error}")
+        arrival_stats = slot_client.arrival_stats
+        bid_stats = slot_client.bid_stats
+        bids = slot_client.latest_bids
 
         # Return the processed data
         return {
@@ -675,7 +848,10 @@ async def get_slot_data():
             "network": slot_data.get("network"),
             "entity": slot_data.get("entity"),
             "arrival_times": arrival_times,
-            "winning_bid": winning_bid,
+            "winning_bid": bids.get("winning_bid"),
+            "winning_relays": bids.get("winning_relays", []),
+            "relays": bids.get("relays", []),
+            "bid_curve": bids.get("bid_curve", []),
             "slot_history": slot_history,
             "arrival_stats": arrival_stats,
             "bid_stats": bid_stats
@@ -687,11 +863,18 @@ async def get_slot_data():
         return {}  # Return empty object instead of error
 
 # DeFiLlama API endpoints
+def set_data_age_header(response: Response, view_name: str):
+    """Report how old the served DeFiLlama data is via the standard Age header"""
+    age = defillama_client.get_data_age(view_name)
+    if age is not None:
+        response.headers["Age"] = str(int(age))
+
 @app.get("/api/defillama/protocols")
-async def get_ethereum_protocols():
+async def get_ethereum_protocols(response: Response):
     """Get top Ethereum DeFi protocols by TVL"""
     try:
         protocols = await defillama_client.get_ethereum_protocols()
+        set_data_age_header(response, "protocols_eth")
         return [
             {
                 "name": p.name,
@@ -706,10 +889,11 @@ async def get_ethereum_protocols():
         return []
 
 @app.get("/api/defillama/yields")
-async def get_ethereum_yields():
+async def get_ethereum_yields(response: Response):
     """Get top yield opportunities on Ethereum"""
     try:
         yields = await defillama_client.get_top_yields()
+        set_data_age_header(response, "yields_eth")
         return [
             {
                 "protocol": y.protocol,
@@ -725,10 +909,11 @@ async def get_ethereum_yields():
         return []
 
 @app.get("/api/defillama/volumes")
-async def get_ethereum_volumes():
+async def get_ethereum_volumes(response: Response):
     """Get DEX volume data for Ethereum"""
     try:
         volumes = await defillama_client.get_dex_volumes()
+        set_data_age_header(response, "volumes_eth")
         return [
             {
                 "name": v.name,
@@ -742,6 +927,29 @@ async def get_ethereum_volumes():
         logging.error(f"Failed to fetch volumes: {e}")
         return []
 
+@app.get("/api/defillama/views")
+async def list_defillama_views():
+    """List the configured DeFiLlama views and the source each is derived from"""
+    return {name: view.source for name, view in defillama_client.views.items()}
+
+@app.get("/api/defillama/views/{view_name}")
+async def get_defillama_view(view_name: str, response: Response):
+    """Get the top-K items of a configured DeFiLlama view"""
+    if view_name not in defillama_client.views:
+        raise HTTPException(status_code=404, detail=f"Unknown view: {view_name}")
+    try:
+        items = await defillama_client.get_view(view_name)
+        set_data_age_header(response, view_name)
+        return [asdict(item) for item in items]
+    except Exception as e:
+        logging.error(f"Failed to fetch DeFiLlama view {view_name}: {e}")
+        return []
+
+@app.get("/api/defillama/timings")
+async def get_defillama_timings():
+    """Get download/process seconds of the last fetch of each DeFiLlama source"""
+    return defillama_client.stage_timings
+
 # Verify dist directory exists before mounting
 if not os.path.exists(REACT_APP_PATH):
     raise RuntimeError(f"Production mode requires the '{REACT_APP_PATH}' directory. Run 'npm run build' in the ui directory first.")
@@ -0,0 +1,435 @@
+import asyncio
+import logging
+import mimetypes
+import os
+import time
+from collections import deque
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from playwright.async_api import async_playwright
+
+DEFAULT_VIEWPORT = {'width': 64, 'height': 64}
+DEFAULT_LAUNCH_ARGS = ['--no-sandbox', '--disable-dev-shm-usage']
+# Chromium features a 64x64 screenshot never uses: GPU, background services,
+# extensions, audio and crash reporting
+MINIMAL_LAUNCH_ARGS = DEFAULT_LAUNCH_ARGS + [
+    '--disable-gpu',
+    '--disable-accelerated-2d-canvas',
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--disable-breakpad',
+    '--disable-features=Translate,MediaRouter,OptimizationHints,BackForwardCache',
+    '--mute-audio',
+    '--no-first-run',
+]
+# Request types the views never need
+BLOCKED_RESOURCE_TYPES = {'media', 'websocket', 'eventsource', 'manifest', 'texttrack', 'other'}
+# Seconds a page may take to answer the health check before it is replaced
+HEALTH_CHECK_TIMEOUT = 2
+# Seconds allowed for closing a page's context; hung renderers may never answer
+CLOSE_TIMEOUT = 5
+# Renders per window over which browser CPU per render is measured
+USAGE_WINDOW_RENDERS = 50
+
+# Anti-aliasing prevention
+PIXEL_STYLE_SCRIPT = """
+    document.addEventListener('DOMContentLoaded', () => {
+        const style = document.createElement('style');
+        style.textContent = `
+            * {
+                image-rendering: pixelated !important;
+                -webkit-font-smoothing: none !important;
+                -moz-osx-font-smoothing: none !important;
+                font-smoothing: none !important;
+                text-rendering: optimizeSpeed !important;
+                transform: translate3d(0, 0, 0);
+                backface-visibility: hidden;
+            }
+        `;
+        document.head.appendChild(style);
+    });
+"""
+
+class PooledPage:
+    """A page in its own browser context, so recycling it frees all its memory"""
+
+    def __init__(self, context, page):
+        self.context = context
+        self.page = page
+        self.renders = 0
+        self.created_at = time.time()
+
+    async def close(self):
+        try:
+            await asyncio.wait_for(self.context.close(), timeout=CLOSE_TIMEOUT)
+        except Exception as e:
+            logging.warning(f"Error closing render page: {e}")
+
+class RenderRouter:
+    """Request handler for render pages.
+
+    Serves API requests from `fetch_api` (in process, without a loopback
+    HTTP round trip) and the UI bundle from memory when `static_dir` is
+    set; other requests are passed through only when same-origin, and
+    requests to other hosts or of unused types are blocked.
+    """
+
+    def __init__(
+        self,
+        origin: str,
+        fetch_api: Callable[[str], Awaitable[Tuple[int, str, bytes]]],
+        static_dir: Optional[str] = None,
+        blocked_paths: Tuple[str, ...] = ()
+    ):
+        self.origin = origin
+        self.fetch_api = fetch_api
+        self.static_dir = os.path.realpath(static_dir) if static_dir else None
+        self.blocked_paths = set(blocked_paths)
+        self._static: Dict[str, Optional[Tuple[bytes, str]]] = {}
+
+        self.api_requests = 0
+        self.static_requests = 0
+        self.passed_requests = 0
+        self.blocked_requests = 0
+
+    async def handle(self, route):
+        request = route.request
+        url = urlsplit(request.url)
+        if (request.resource_type in BLOCKED_RESOURCE_TYPES
+                or f"{url.scheme}://{url.netloc}" != self.origin
+                or url.path in self.blocked_paths):
+            self.blocked_requests += 1
+            await route.abort()
+            return
+
+        if url.path.startswith('/api/'):
+            if request.method != 'GET':
+                self.blocked_requests += 1
+                await route.abort()
+                return
+            self.api_requests += 1
+            try:
+                status, content_type, body = await self.fetch_api(f"{url.path}?{url.query}" if url.query else url.path)
+            except Exception as e:
+                logging.error(f"Error serving {url.path} to render page: {e}")
+                status, content_type, body = 502, 'text/plain', str(e).encode()
+            await route.fulfill(status=status, content_type=content_type, body=body)
+        elif self.static_dir:
+            self.static_requests += 1
+            asset = self._load_static(url.path)
+            if asset is None:
+                await route.fulfill(status=404, body=b'')
+            else:
+                await route.fulfill(status=200, content_type=asset[1], body=asset[0])
+        else:
+            self.passed_requests += 1
+            await route.continue_()
+
+    def _load_static(self, path: str) -> Optional[Tuple[bytes, str]]:
+        """File of the built UI (cached), index.html for client-side routes"""
+        if path not in self._static:
+            file_path = os.path.realpath(os.path.join(self.static_dir, path.lstrip('/')))
+            if not file_path.startswith(self.static_dir + os.sep) or not os.path.isfile(file_path):
+                # Routes without an extension are client-side views; missing assets are 404s
+                if os.path.splitext(path)[1]:
+                    self._static[path] = None
+                    return None
+                file_path = os.path.join(self.static_dir, 'index.html')
+            content_type = mimetypes.guess_type(file_path)[0] or 'application/octet-stream'
+            with open(file_path, 'rb') as f:
+                self._static[path] = (f.read(), content_type)
+        return self._static[path]
+
+    def get_metrics(self) -> Dict:
+        return {
+            "api": self.api_requests,
+            "static": self.static_requests,
+            "passed": self.passed_requests,
+            "blocked": self.blocked_requests
+        }
+
+def _browser_usage(root_pid: int) -> Optional[Tuple[int, float]]:
+    """RSS bytes and CPU seconds of the Chromium processes started by the
+    Playwright driver below `root_pid`, excluding the driver (Linux /proc only)"""
+    try:
+        processes = {}
+        for entry in os.listdir('/proc'):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f'/proc/{entry}/stat') as f:
+                    stat = f.read()
+            except OSError:
+                continue
+            fields = stat[stat.rindex(')') + 2:].split()
+            command = stat[stat.index('(') + 1:stat.rindex(')')]
+            processes[int(entry)] = (command, int(fields[1]), int(fields[11]) + int(fields[12]), int(fields[21]))
+    except (OSError, ValueError, IndexError):
+        return None
+
+    children: Dict[int, List[int]] = {}
+    for pid, (_, ppid, _, _) in processes.items():
+        children.setdefault(ppid, []).append(pid)
+    rss_pages = cpu_ticks = 0
+    # The Playwright driver is a node child of this process; Chromium runs below it
+    drivers = [pid for pid in children.get(root_pid, []) if processes[pid][0] == 'node']
+    stack = [pid for driver in drivers for pid in children.get(driver, [])]
+    while stack:
+        pid = stack.pop()
+        _, _, ticks, rss = processes[pid]
+        cpu_ticks += ticks
+        rss_pages += rss
+        stack.extend(children.get(pid, []))
+    return rss_pages * os.sysconf('SC_PAGE_SIZE'), cpu_ticks / os.sysconf('SC_CLK_TCK')
+
+class RenderPool:
+    """Pool of headless Chromium pages rendering views to PNG concurrently.
+
+    Each render checks out a page, health-checks it, and renders under a
+    timeout. Pages that fail or time out are replaced instead of tearing
+    down the browser, and pages are recycled after `max_renders` renders
+    to contain Chromium memory growth. The browser is relaunched if it
+    disconnects.
+
+    `launch_args` and `router` make up the
+    renderer profile; see MINIMAL_LAUNCH_ARGS and RenderRouter.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        render_timeout: float = 10,
+        max_renders: int = 200,
+        viewport: Dict[str, int] = DEFAULT_VIEWPORT,
+        launch_args: Optional[List[str]] = None,
+        router: Optional[RenderRouter] = None
+    ):
+        self.size = size
+        self.render_timeout = render_timeout
+        self.max_renders = max_renders
+        self.viewport = viewport
+        self.launch_args = launch_args or DEFAULT_LAUNCH_ARGS
+        self.router = router
+        self._playwright = None
+        self._browser = None
+        self._idle: Optional[asyncio.Queue] = None
+        self._launch_lock = asyncio.Lock()
+        self.running = False
+        # Renders holding a page; stop() waits for them before closing the browser
+        self._in_flight = 0
+        self._idle_renders = asyncio.Event()
+        self._idle_renders.set()
+
+        self.renders = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.unhealthy = 0
+        self.recycled = 0
+        self.browser_restarts = 0
+        self._render_times = deque(maxlen=100)
+        # Renders, browser CPU seconds and replaced pages at the start of the current usage window
+        self._usage_mark: Optional[Tuple[int, float, int]] = None
+        self._replaced_pages = 0
+        self._cpu_per_render: Optional[float] = None
+
+    async def start(self):
+        self._idle = asyncio.Queue()
+        self.running = True
+        await self._ensure_browser()
+        for _ in range(self.size):
+            self._idle.put_nowait(await self._new_page())
+        logging.info(f"Started render pool with {self.size} page(s)")
+
+    async def stop(self):
+        """Stop handing out pages, wait for renders in flight, then close the browser"""
+        self.running = False
+        try:
+            await asyncio.wait_for(self._idle_renders.wait(), timeout=2 * self.render_timeout + CLOSE_TIMEOUT)
+        except asyncio.TimeoutError:
+            logging.warning(f"Closing browser with {self._in_flight} render(s) still in flight")
+        if self._idle:
+            while not self._idle.empty():
+                await self._idle.get_nowait().close()
+        if self._browser:
+            try:
+                await self._browser.close()
+            except Exception as e:
+                logging.warning(f"Error closing browser: {e}")
+        if self._playwright:
+            await self._playwright.stop()
+        self._browser = None
+        self._playwright = None
+
+    async def _ensure_browser(self):
+        async with self._launch_lock:
+            if not self.running:
+                raise RuntimeError("Render pool is stopped")
+            if self._browser and self._browser.is_connected():
+                return
+            if self._browser:
+                self.browser_restarts += 1
+                logging.warning("Browser disconnected, relaunching")
+            if not self._playwright:
+                self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(args=self.launch_args)
+
+    async def _new_page(self) -> PooledPage:
+        """Create a page, bounded by the render timeout so a wedged browser cannot hold up the pool"""
+        if not self.running:
+            raise RuntimeError("Render pool is stopped")
+        await self._ensure_browser()
+        return await asyncio.wait_for(self._create_page(), timeout=self.render_timeout)
+
+    async def _create_page(self) -> PooledPage:
+        context = await self._browser.new_context(
+            viewport=self.viewport,
+            device_scale_factor=1,
+        )
+        if self.router:
+            await context.route("**/*", self.router.handle)
+        page = await context.new_page()
+        await page.add_init_script(PIXEL_STYLE_SCRIPT)
+        return PooledPage(context, page)
+
+    async def _is_healthy(self, pooled: PooledPage) -> bool:
+        if pooled.page.is_closed() or not self._browser.is_connected():
+            return False
+        try:
+            await asyncio.wait_for(pooled.page.evaluate("1"), timeout=HEALTH_CHECK_TIMEOUT)
+            return True
+        except Exception:
+            return False
+
+    async def _replace(self, pooled: PooledPage) -> Optional[PooledPage]:
+        self._replaced_pages += 1
+        await pooled.close()
+        if not self.running:
+            return None
+        try:
+            return await self._new_page()
+        except Exception as e:
+            logging.error(f"Failed to create render page: {e!r}")
+            return None
+
+    async def render(self, url: str, settle_ms: int = 500) -> Optional[Tuple[bytes, float]]:
+        """Render `url` to a PNG, returning (png, time the screenshot started).
+
+        Waits for an idle page; returns None if the render fails or times out.
+        """
+        pooled = await self._idle.get()
+        self._in_flight += 1
+        self._idle_renders.clear()
+        try:
+            if not await self._is_healthy(pooled):
+                self.unhealthy += 1
+                pooled = await self._replace(pooled)
+                if pooled is None:
+                    return None
+
+            started = time.time()
+            try:
+                frame = await asyncio.wait_for(self._render(pooled.page, url, settle_ms), timeout=self.render_timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                logging.warning(f"Render of {url} timed out after {self.render_timeout}s, replacing page")
+                pooled = await self._replace(pooled)
+                return None
+            except Exception as e:
+                self.failures += 1
+                logging.error(f"Render of {url} failed: {e}")
+                pooled = await self._replace(pooled)
+                return None
+
+            self.renders += 1
+            self._render_times.append(time.time() - started)
+            if self._usage_mark is None or self.renders - self._usage_mark[0] >= USAGE_WINDOW_RENDERS:
+                self._sample_usage()
+            pooled.renders += 1
+            if pooled.renders >= self.max_renders:
+                self.recycled += 1
+                pooled = await self._replace(pooled)
+            return frame
+        finally:
+            if not self.running:
+                if pooled is not None:
+                    await pooled.close()
+            # Keep the pool at full size even if a replacement failed
+            elif pooled is not None:
+                self._idle.put_nowait(pooled)
+            else:
+                asyncio.create_task(self._refill())
+            self._in_flight -= 1
+            if not self._in_flight:
+                self._idle_renders.set()
+
+    async def _refill(self):
+        while True:
+            await asyncio.sleep(5)
+            if not self.running:
+                return
+            try:
+                self._idle.put_nowait(await self._new_page())
+                return
+            except Exception as e:
+                logging.error(f"Failed to refill render pool: {e}")
+
+    async def _render(self, page, url: str, settle_ms: int) -> Tuple[bytes, float]:
+        await page.goto(url)
+        await page.wait_for_timeout(settle_ms)
+        captured_at = time.time()
+        screenshot = await page.screenshot(
+            type='png',
+            omit_background=False,
+            scale='css',
+            animations='disabled',
+        )
+        return screenshot, captured_at
+
+    def _sample_usage(self):
+        """Close the current usage window, measuring browser CPU seconds per render over it"""
+        usage = _browser_usage(os.getpid())
+        if usage is None:
+            return
+        cpu = usage[1]
+        # CPU time of renderer processes that exited with a replaced page is
+        # no longer counted, so windows with replacements are skipped
+        if self._usage_mark and self._usage_mark[2] == self._replaced_pages:
+            self._cpu_per_render = (cpu - self._usage_mark[1]) / (self.renders - self._usage_mark[0])
+        self._usage_mark = (self.renders, cpu, self._replaced_pages)
+
+    def _resource_usage(self) -> Optional[Dict]:
+        """Browser RSS now, and CPU seconds per render over the last full window"""
+        usage = _browser_usage(os.getpid())
+        if usage is None:
+            return None
+        rss, cpu = usage
+        return {
+            "rss_mb": round(rss / 1024 / 1024, 1),
+            "cpu_seconds": round(cpu, 2),
+            "cpu_seconds_per_render": round(self._cpu_per_render, 4) if self._cpu_per_render is not None else None,
+            "window_renders": USAGE_WINDOW_RENDERS
+        }
+
+    def get_metrics(self) -> Dict:
+        times = self._render_times
+        return {
+            "resources": self._resource_usage(),
+            "requests": self.router.get_metrics() if self.router else None,
+            "size": self.size,
+            "idle_pages": self._idle.qsize() if self._idle else 0,
+            "renders": self.renders,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "unhealthy": self.unhealthy,
+            "recycled": self.recycled,
+            "browser_restarts": self.browser_restarts,
+            "render_time": {
+                "last": round(times[-1], 3) if times else None,
+                "avg": round(sum(times) / len(times), 3) if times else None,
+                "max": round(max(times), 3) if times else None
+            }
+        }
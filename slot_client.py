@@ -3,8 +3,33 @@ import asyncio
 import json
 import logging
 import time
+import numpy as np
+from bisect import bisect_left
+from collections import OrderedDict, deque
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set
+
+# Ethereum mainnet genesis timestamp: 1606824023 (Dec 1, 2020, 12:00:23 PM UTC),
+# used until the beacon node's genesis is passed to start()
+MAINNET_GENESIS_TIME = 1606824023
+MAINNET_SECONDS_PER_SLOT = 12
+
+# Lab data is complete a few slots after the slot itself
+FETCH_LAG_SLOTS = 3
+# Seconds into each slot at which the background fetcher runs
+FETCH_SLOT_OFFSET = 4
+FETCH_CONCURRENCY = 4
+FETCH_RETRIES = 3
+FETCH_RETRY_DELAY = 1  # Doubles on each retry
+# Head-triggered fetches: default seconds to wait after a head event, then
+# attempts (this many seconds apart) until the lab data looks complete
+HEAD_FETCH_DELAY = 4
+HEAD_FETCH_ATTEMPTS = 5
+HEAD_FETCH_RETRY_INTERVAL = 3
+# While the mev view is not shown, only the latest slot is fetched this often
+KEEP_WARM_SLOTS = 20
+# Points kept in the best-bid-over-time curve of the latest slot
+BID_CURVE_POINTS = 24
 
 class SlotClient:
     """Client for fetching slot data from ethpandaops lab"""
@@ -13,10 +38,33 @@ class SlotClient:
         self.base_url = "https://lab-api.primary.production.platform.ethpandaops.io/lab-data/api/labapi.LabAPI/GetSlotData"
         self.network = "mainnet"
         self.latest_slot_data = None
+        self.latest_slot = -1
+        self.latest_summary: Dict = {}
+        # Winning bid, per-relay best bids and bid curve of the latest slot
+        self.latest_bids: Dict = {}
+        # Slot -> (node count, arrival times), so refetches of unchanged timings are free
+        self._arrival_cache: "OrderedDict[int, tuple]" = OrderedDict()
         self.last_update_time = 0
-        self.update_interval = 12  # 12 seconds (3 slots)
-        self.slot_payloads = []  # List to store last N slot payloads
+        self.genesis_time = MAINNET_GENESIS_TIME
+        self.seconds_per_slot = MAINNET_SECONDS_PER_SLOT
+        # Highest slot the background fetcher has requested, and older slots
+        # within the history window that still need to be fetched
+        self.last_requested_slot = -1
+        self.missing_slots: Set[int] = set()
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Head-triggered fetches in flight, by slot
+        self.head_fetch_delay: Optional[float] = None
+        self._head_fetches: Dict[int, asyncio.Task] = {}
+        self._last_head_slot = -1
+        # Fetch every slot while active, only keep the latest data warm otherwise
+        self.active = True
         self.max_history = 16   # Maximum number of slots to keep
+        # Compact per-slot summaries ordered by slot (oldest first), built once on ingest
+        self.slot_history: deque = deque()
+        self._history_slots: List[int] = []  # Slot numbers of slot_history, for ordered inserts
+        self._history_newest_first: List[Dict] = []
+        self.bid_stats: Dict = {}
+        self.arrival_stats: Dict = {}
         self.headers = {
             'accept': '*/*',
             'accept-language': 'en-US,en;q=0.9',
@@ -29,14 +77,70 @@ class SlotClient:
         # Start background fetch task
         self.fetch_task = None
         
-    async def start(self):
-        """Start background fetching task"""
+    async def start(self, genesis_time: Optional[int] = None, seconds_per_slot: Optional[int] = None):
+        """Start background fetching task, aligned to the given chain's slot boundaries"""
+        if genesis_time is not None:
+            self.genesis_time = genesis_time
+        if seconds_per_slot is not None:
+            self.seconds_per_slot = seconds_per_slot
         if self.fetch_task is None:
             self.fetch_task = asyncio.create_task(self._background_fetch())
             logging.info("Started slot data background fetch task")
     
+    def attach_to_beacon(self, beacon_client, delay: float = HEAD_FETCH_DELAY):
+        """
+        Fetch each new slot shortly after the beacon node's head event for it,
+        instead of waiting for the background fetcher to reach it.
+        """
+        self.head_fetch_delay = delay
+        beacon_client.add_head_listener(self._on_head_event)
+        logging.info(f"Slot data fetches follow head events with a {delay}s delay")
+
+    def set_active(self, active: bool):
+        """Fetch every slot while active, otherwise only every KEEP_WARM_SLOTS slots"""
+        if active != self.active:
+            self.active = active
+            if active:
+                # Backfill the history window, including slots skipped between keep-warm fetches
+                window_start = self.calculate_current_slot() - FETCH_LAG_SLOTS - self.max_history
+                self.last_requested_slot = min(self.last_requested_slot, window_start)
+            logging.info(f"Slot data fetching {'active' if active else 'in keep-warm mode'}")
+
+    async def _on_head_event(self, event: Dict):
+        if not self.active:
+            return
+        slot = int(event['slot'])
+        if slot <= self._last_head_slot:
+            return
+        self._last_head_slot = slot
+        self._head_fetches[slot] = asyncio.create_task(self._fetch_head_slot(slot))
+
+    async def _fetch_head_slot(self, slot: int):
+        """Fetch a new head slot until its lab data is complete or attempts run out"""
+        try:
+            await asyncio.sleep(self.head_fetch_delay)
+            for attempt in range(HEAD_FETCH_ATTEMPTS):
+                if self._is_complete(await self._fetch_slot_data(slot)):
+                    logging.debug(f"Lab data for slot {slot} complete after {attempt + 1} attempts")
+                    return
+                await asyncio.sleep(HEAD_FETCH_RETRY_INTERVAL)
+        finally:
+            self._head_fetches.pop(slot, None)
+
+    def _is_complete(self, slot_data: Optional[Dict]) -> bool:
+        """Whether a fetched payload has the block, node timings and relay bids"""
+        if not slot_data:
+            return False
+        return bool(
+            (slot_data.get("block") or {}).get("execution_payload_block_hash")
+            and (slot_data.get("timings") or {}).get("block_seen")
+            and slot_data.get("relay_bids")
+        )
+
     async def stop(self):
         """Stop background fetching task"""
+        for task in list(self._head_fetches.values()):
+            task.cancel()
         if self.fetch_task:
             self.fetch_task.cancel()
             try:
@@ -45,31 +149,79 @@ class SlotClient:
                 pass
             self.fetch_task = None
             logging.info("Stopped slot data background fetch task")
+        if self._session:
+            await self._session.close()
+            self._session = None
     
     async def _background_fetch(self):
-        """Background task to periodically fetch slot data"""
+        """Background task fetching every slot up to the head once per slot"""
         while True:
             try:
-                # Calculate current slot - 3 to ensure data is available
-                slot = self.calculate_current_slot() - 3
-                await self._fetch_slot_data(slot)
+                target_slot = self.calculate_current_slot() - FETCH_LAG_SLOTS
+                if self.active:
+                    await self._catch_up(target_slot)
+                elif target_slot - self.last_requested_slot >= KEEP_WARM_SLOTS:
+                    # Skip the backlog, just refresh the latest slot
+                    self.last_requested_slot = target_slot - 1
+                    self.missing_slots.clear()
+                    await self._catch_up(target_slot)
             except Exception as e:
                 logging.error(f"Error in background fetch: {e}")
             
-            # Wait for next update interval
-            await asyncio.sleep(self.update_interval)
+            # Wait for the next slot boundary
+            next_fetch = self.get_slot_start_time(self.calculate_current_slot() + 1) + FETCH_SLOT_OFFSET
+            await asyncio.sleep(max(0.0, next_fetch - time.time()))
+    
+    async def _catch_up(self, target_slot: int):
+        """Fetch all slots up to `target_slot` not fetched yet, plus earlier failures"""
+        oldest_wanted = target_slot - self.max_history + 1
+        start = max(self.last_requested_slot + 1, oldest_wanted)
+        self.missing_slots.update(range(start, target_slot + 1))
+        self.last_requested_slot = max(self.last_requested_slot, target_slot)
+        # Give up on slots that have fallen out of the history window
+        self.missing_slots = {
+            slot for slot in self.missing_slots
+            if slot >= oldest_wanted and not self._in_history(slot)
+        }
+        # Slots being fetched on their head event are skipped this round only,
+        # so they are backfilled if all head attempts fail
+        slots = sorted(slot for slot in self.missing_slots if slot not in self._head_fetches)
+        if not slots:
+            return
+
+        semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+
+        async def fetch(slot: int):
+            async with semaphore:
+                # Earlier failures (e.g. missed slots) get a single attempt per round
+                retries = FETCH_RETRIES if slot >= start else 0
+                if await self._fetch_with_retries(slot, retries):
+                    self.missing_slots.discard(slot)
+
+        if len(slots) > 1:
+            logging.info(f"Fetching {len(slots)} slots from lab ({slots[0]} - {slots[-1]})")
+        await asyncio.gather(*(fetch(slot) for slot in slots))
+
+    async def _fetch_with_retries(self, slot: int, retries: int = FETCH_RETRIES) -> bool:
+        for attempt in range(retries + 1):
+            if await self._fetch_slot_data(slot) is not None:
+                return True
+            if attempt < retries:
+                await asyncio.sleep(FETCH_RETRY_DELAY * 2 ** attempt)
+        logging.warning(f"Giving up on lab data for slot {slot} after {retries + 1} attempts")
+        return False
     
+    def _in_history(self, slot: int) -> bool:
+        index = bisect_left(self._history_slots, slot)
+        return index < len(self._history_slots) and self._history_slots[index] == slot
+
     def calculate_current_slot(self) -> int:
         """Calculate the current slot based on time since genesis"""
-        # Ethereum mainnet genesis timestamp: 1606824023 (Dec 1, 2020, 12:00:23 PM UTC)
-        genesis_time = 1606824023
-        slot_time = 12  # 12 seconds per slot
-        
-        current_time = int(time.time())
-        seconds_since_genesis = current_time - genesis_time
-        
-        current_slot = seconds_since_genesis // slot_time
-        return current_slot
+        seconds_since_genesis = int(time.time()) - self.genesis_time
+        return seconds_since_genesis // self.seconds_per_slot
+
+    def get_slot_start_time(self, slot: int) -> float:
+        return self.genesis_time + slot * self.seconds_per_slot
     
     async def get_slot_data(self) -> Dict:
         """
@@ -78,10 +230,10 @@ class SlotClient:
         """
         return self.latest_slot_data if self.latest_slot_data else {}
     
-    async def _fetch_slot_data(self, slot: int) -> Dict:
+    async def _fetch_slot_data(self, slot: int) -> Optional[Dict]:
         """
         Internal method to fetch slot data from ethpandaops lab.
-        This updates our internal cache but doesn't return anything.
+        This updates our internal cache and returns the fetched payload, None on failure.
         """
         try:
             # Prepare the message parameter for the API call
@@ -93,42 +245,121 @@ class SlotClient:
             # Build the query URL with proper encoding
             url = f"{self.base_url}?connect=v1&encoding=json&message={message}"
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=self.headers) as response:
-                    if response.status == 200:
-                        response_data = await response.json()
-                        if 'data' in response_data and response_data['data'] is not None:
-                            new_slot_data = response_data['data']
-
-                            # Only add to history if it's a new slot
-                            if (self.latest_slot_data is None or
-                                new_slot_data.get('slot') != self.latest_slot_data.get('slot')):
-                                
-                                # Clean entity name for display
-                                if 'entity' in new_slot_data and new_slot_data['entity']:
-                                    new_slot_data['entity'] = self._clean_entity_name(new_slot_data['entity'])
-
-                                # Store the complete payload
-                                self.slot_payloads.append(new_slot_data)
-                                
-                                # Keep only the most recent N payloads
-                                if len(self.slot_payloads) > self.max_history:
-                                    self.slot_payloads.pop(0)  # Remove oldest entry
-
-                            # Store the full response data
-                            self.latest_slot_data = new_slot_data
-                            self.last_update_time = time.time()
-                            logging.info(f"Updated slot data for slot {slot}")
-                        else:
-                            logging.error(f"Invalid response format or empty data: {response_data}")
-                    else:
-                        logging.error(f"Failed to fetch slot data: {response.status}")
+            if self._session is None:
+                self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10))
+
+            async with self._session.get(url, headers=self.headers) as response:
+                if response.status == 200:
+                    response_data = await response.json()
+                    if 'data' in response_data and response_data['data'] is not None:
+                        self._ingest_slot(slot, response_data['data'])
+                        logging.info(f"Updated slot data for slot {slot}")
+                        return response_data['data']
+                    logging.error(f"Invalid response format or empty data for slot {slot}: {response_data}")
+                else:
+                    logging.error(f"Failed to fetch slot data for slot {slot}: {response.status}")
 
         except Exception as e:
-            logging.error(f"Error fetching slot data: {e}")
+            logging.error(f"Error fetching slot data for slot {slot}: {e}")
         
-        return self.latest_slot_data if self.latest_slot_data else {}
+        return None
     
+    def _ingest_slot(self, slot: int, slot_data: Dict) -> bool:
+        """
+        Summarize a slot payload into the history and update the history stats.
+        Only the newest slot's full payload is kept. A refetched slot replaces
+        its entry. Returns False for slots older than all of a full history.
+        """
+        # Clean entity name for display
+        if 'entity' in slot_data and slot_data['entity']:
+            slot_data['entity'] = self._clean_entity_name(slot_data['entity'])
+
+        bids = self._index_bids(slot_data)
+        winning_bid = bids.get("winning_bid")
+        summary = {
+            "slot": slot_data.get("slot"),
+            "entity": slot_data.get("entity", "unknown"),
+            "bid_value": winning_bid.get("value") if winning_bid else None,
+            "arrival_times": self._extract_arrival_times(slot_data, slot)
+        }
+
+        if slot >= self.latest_slot:
+            self.latest_slot = slot
+            self.latest_slot_data = slot_data
+            self.latest_summary = summary
+            self.latest_bids = bids
+            self.last_update_time = time.time()
+
+        index = bisect_left(self._history_slots, slot)
+        if index < len(self._history_slots) and self._history_slots[index] == slot:
+            # Refetch with more complete data
+            self.slot_history[index] = summary
+        elif index == 0 and len(self.slot_history) >= self.max_history:
+            return False
+        else:
+            self._history_slots.insert(index, slot)
+            self.slot_history.insert(index, summary)
+
+        # Keep only the most recent N slots
+        if len(self.slot_history) > self.max_history:
+            self._history_slots.pop(0)
+            self.slot_history.popleft()
+
+        self._history_newest_first = list(reversed(self.slot_history))
+        self._update_history_stats()
+        return True
+
+    @staticmethod
+    def _bid_eth(summary: Dict) -> Optional[float]:
+        if not summary.get("bid_value"):
+            return None
+        try:
+            return int(summary["bid_value"]) / 1e18
+        except (ValueError, TypeError):
+            return None
+
+    def _update_history_stats(self):
+        """Recompute bid/arrival stats of the history (oldest first) once per ingest"""
+        self.bid_stats = {}
+        self.arrival_stats = {}
+        if len(self.slot_history) <= 1:
+            return
+
+        bid_values = [v for v in (self._bid_eth(s) for s in self.slot_history) if v is not None]
+        if len(bid_values) > 1:
+            self.bid_stats = {
+                "highest": max(bid_values),
+                "lowest": min(bid_values),
+                "average": sum(bid_values) / len(bid_values),
+                "count": len(bid_values)
+            }
+
+            # Trend over the last 3 slots (positive is increasing, negative is decreasing)
+            if len(bid_values) >= 3:
+                oldest, newest = bid_values[-3], bid_values[-1]
+                self.bid_stats["trend"] = newest - oldest
+                self.bid_stats["trend_pct"] = (newest - oldest) / oldest * 100 if oldest > 0 else 0
+
+        history_times = [
+            s["arrival_times"]["fastest_time"] for s in self.slot_history
+            if s["arrival_times"].get("fastest_time") is not None
+        ]
+        if history_times:
+            sorted_times = sorted(history_times)
+            self.arrival_stats = {
+                "fastest": sorted_times[0],
+                "slowest": sorted_times[-1],
+                "average": sum(history_times) / len(history_times),
+                "median": sorted_times[len(sorted_times) // 2],
+                "count": len(history_times)
+            }
+
+            # Trend over the last 4 slots (negative is improving/faster, positive is degrading/slower)
+            if len(history_times) >= 4:
+                oldest, newest = history_times[-4], history_times[-1]
+                self.arrival_stats["trend"] = newest - oldest
+                self.arrival_stats["trend_pct"] = (newest - oldest) / oldest * 100 if oldest > 0 else 0
+
     def _clean_entity_name(self, entity: str) -> str:
         """Clean up entity name for display"""
         if not entity:
@@ -150,90 +381,143 @@ class SlotClient:
             
         return entity
     
-    def _extract_bid_value(self, slot_data: Dict) -> Optional[str]:
-        """Extract the winning bid value from slot data"""
+    def _index_bids(self, slot_data: Dict) -> Dict:
+        """
+        Index all relay bids of a slot by block hash in a single pass.
+        Returns the winning bid (tagged with its relay), the best bid of each
+        relay, the relays that carried the winning block and the best bid
+        value over time within the slot.
+        """
+        result = {}
         try:
             block_hash = slot_data.get("block", {}).get("execution_payload_block_hash")
-            relay_bids = slot_data.get("relay_bids", {})
-
-            if block_hash and relay_bids:
-                for relay_name, relay_data in relay_bids.items():
-                    bids = relay_data.get("bids", [])
-                    for bid in bids:
-                        if bid.get("block_hash") == block_hash:
-                            return bid.get("value")
+            relay_bids = slot_data.get("relay_bids") or {}
+
+            bids_by_hash: Dict[str, List] = {}
+            relays = []
+            timed_bids = []
+            for relay_name, relay_data in relay_bids.items():
+                best_bid = None
+                best_value = -1
+                bids = relay_data.get("bids") or []
+                for bid in bids:
+                    bids_by_hash.setdefault(bid.get("block_hash"), []).append((relay_name, bid))
+                    value = self._bid_wei(bid)
+                    if value is None:
+                        continue
+                    if value > best_value:
+                        best_bid, best_value = bid, value
+                    bid_time = bid.get("slot_time")
+                    if isinstance(bid_time, (int, float)):
+                        timed_bids.append((bid_time, value))
+                if best_bid is not None:
+                    relays.append({
+                        "relay_name": relay_name,
+                        "value": best_bid.get("value"),
+                        "block_hash": best_bid.get("block_hash"),
+                        "bid_count": len(bids)
+                    })
+
+            relays.sort(key=lambda r: self._bid_wei(r) or 0, reverse=True)
+            result["relays"] = relays
+
+            winning = bids_by_hash.get(block_hash) if block_hash else None
+            if winning:
+                relay_name, bid = winning[0]
+                result["winning_bid"] = {**bid, "relay_name": relay_name}
+                result["winning_relays"] = [name for name, _ in winning]
+
+            result["bid_curve"] = self._bid_curve(timed_bids)
         except Exception as e:
-            logging.error(f"Error extracting bid value: {e}")
-            
-        return None
+            logging.error(f"Error indexing relay bids: {e}")
+
+        return result
+
+    @staticmethod
+    def _bid_wei(bid: Dict) -> Optional[int]:
+        try:
+            return int(bid.get("value"))
+        except (ValueError, TypeError):
+            return None
+
+    @staticmethod
+    def _bid_curve(timed_bids: List, points: int = BID_CURVE_POINTS) -> List[Dict]:
+        """Best bid value (in ETH) seen by each point in time of the slot, in ms"""
+        if not timed_bids:
+            return []
+
+        timed_bids.sort()
+        curve = []
+        best = 0
+        for bid_time, value in timed_bids:
+            if value > best:
+                best = value
+                curve.append({"time": bid_time, "value": best / 1e18})
+
+        # Keep the last point (the highest bid) when thinning the curve
+        if len(curve) > points:
+            step = len(curve) / points
+            curve = [curve[int(i * step)] for i in range(points - 1)] + [curve[-1]]
+        return curve
     
-    def _extract_arrival_times(self, slot_data: Dict) -> Dict:
-        """Extract arrival time information from slot data"""
+    def _extract_arrival_times(self, slot_data: Dict, slot: Optional[int] = None) -> Dict:
+        """Extract arrival time information from slot data, cached by slot"""
         arrival_times = {}
         try:
-            if "timings" in slot_data and slot_data["timings"] is not None:
-                block_seen = slot_data.get("timings", {}).get("block_seen", {})
-                if block_seen and len(block_seen) > 0:
-                    arrival_values = []
-                    for val in block_seen.values():
-                        try:
-                            if isinstance(val, str) and val.isdigit():
-                                arrival_values.append(int(val))
-                            elif isinstance(val, (int, float)):
-                                arrival_values.append(int(val))
-                            elif isinstance(val, str):
-                                # Try to handle string representations of floats
-                                cleaned_val = val.strip().replace(',', '')
-                                if cleaned_val.replace('.', '', 1).isdigit():
-                                    arrival_values.append(int(float(cleaned_val)))
-                        except (ValueError, TypeError):
-                            continue
-
-                    if arrival_values:
-                        # Filter out extreme outliers (more than 3x median)
-                        arrival_values.sort()
-                        median_idx = len(arrival_values) // 2
-                        median = arrival_values[median_idx]
-                        filtered_values = [v for v in arrival_values if v < median * 3]
-
-                        if filtered_values:
-                            arrival_times = {
-                                "fastest_time": min(filtered_values),
-                                "slowest_time": max(filtered_values),
-                                "nodes_count": len(arrival_values)  # Keep original count for reference
-                            }
+            block_seen = (slot_data.get("timings") or {}).get("block_seen") or {}
+            if not block_seen:
+                return arrival_times
+
+            cached = self._arrival_cache.get(slot) if slot is not None else None
+            if cached is not None and cached[0] == len(block_seen):
+                return cached[1]
+
+            values = self._parse_arrival_values(list(block_seen.values()))
+            if len(values):
+                # Filter out extreme outliers (more than 3x median)
+                median = np.partition(values, len(values) // 2)[len(values) // 2]
+                filtered = values[values < median * 3]
+
+                if len(filtered):
+                    p50, p90 = np.percentile(filtered, [50, 90])
+                    arrival_times = {
+                        "fastest_time": int(filtered.min()),
+                        "slowest_time": int(filtered.max()),
+                        "median_time": int(p50),
+                        "p90_time": int(p90),
+                        "nodes_count": int(len(values))  # Keep original count for reference
+                    }
+
+            if slot is not None:
+                self._arrival_cache[slot] = (len(block_seen), arrival_times)
+                while len(self._arrival_cache) > self.max_history * 2:
+                    self._arrival_cache.popitem(last=False)
         except Exception as e:
             logging.error(f"Error processing arrival times: {e}")
             
         return arrival_times
+
+    @staticmethod
+    def _parse_arrival_values(raw_values: List) -> np.ndarray:
+        """Convert node timings (ints, or numeric strings possibly with commas) to
+        a non-negative int64 array, dropping values that are not numbers"""
+        try:
+            values = np.asarray(raw_values, dtype=np.float64)
+        except (ValueError, TypeError):
+            # Mixed or malformed entries: clean the strings and parse what we can
+            cleaned = np.char.strip(np.char.replace(np.asarray(raw_values, dtype=str), ',', ''))
+            values = np.full(len(cleaned), np.nan)
+            for i, val in enumerate(cleaned):
+                try:
+                    values[i] = float(val)
+                except ValueError:
+                    continue
+        values = values[np.isfinite(values) & (values >= 0)]
+        return values.astype(np.int64)
     
     def get_slot_history(self) -> List[Dict]:
         """
-        Return the slot history constructed from stored payloads.
+        Return the slot history summaries, newest first.
         Each history entry contains the slot, entity, bid value, and arrival times.
         """
-        history = []
-        
-        # Process each payload to extract only what we need for the frontend
-        for payload in self.slot_payloads:
-            slot_number = payload.get("slot")
-            entity = payload.get("entity", "unknown")
-            
-            # Extract bid value
-            bid_value = self._extract_bid_value(payload)
-            
-            # Extract arrival times
-            arrival_times = self._extract_arrival_times(payload)
-            
-            # Add to history
-            history.append({
-                "slot": slot_number,
-                "entity": entity,
-                "bid_value": bid_value,
-                "arrival_times": arrival_times
-            })
-        
-        # Sort by slot number (descending, newest first)
-        history.sort(key=lambda x: x.get("slot", 0), reverse=True)
-        
-        return history
\ No newline at end of file
+        return self._history_newest_first
@@ -0,0 +1,175 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+class SlotStore:
+    """SQLite store for per-slot summaries, arrival times, rewards and duties.
+
+    Writes are buffered in memory and flushed in one transaction from a
+    worker thread, so the event loop never waits on disk I/O.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._pending_slots: Dict[int, Tuple[str, str]] = {}
+        self._pending_arrivals: Dict[int, int] = {}
+        self._pending_rewards: Dict[Tuple[int, str], str] = {}
+        self._pending_duties: Dict[Tuple[int, str], Tuple[str, str]] = {}
+
+    def open(self):
+        """Open the database and create tables if needed"""
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS slots (
+                slot INTEGER PRIMARY KEY,
+                status TEXT NOT NULL,
+                summary TEXT
+            );
+            CREATE TABLE IF NOT EXISTS arrivals (
+                slot INTEGER PRIMARY KEY,
+                arrival_ms INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS validator_rewards (
+                epoch INTEGER NOT NULL,
+                validators TEXT NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (epoch, validators)
+            );
+            CREATE TABLE IF NOT EXISTS duties (
+                epoch INTEGER NOT NULL,
+                duty_type TEXT NOT NULL,
+                validators TEXT NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (epoch, duty_type)
+            );
+        """)
+        self._conn.commit()
+        logging.info(f"Opened slot store at {self.path}")
+
+    def close(self):
+        """Flush pending writes and close the database"""
+        if self._conn:
+            self.flush()
+            self._conn.close()
+            self._conn = None
+
+    def save_slot(self, slot: int, status: str, summary: Optional[Dict] = None):
+        self._pending_slots[slot] = (status, json.dumps(summary) if summary else None)
+
+    def save_arrival(self, slot: int, arrival_ms: int):
+        self._pending_arrivals[slot] = arrival_ms
+
+    def save_rewards(self, epoch: int, validators: List[str], rewards: List[Dict]):
+        self._pending_rewards[(epoch, ','.join(validators))] = json.dumps(rewards)
+
+    def save_duties(self, epoch: int, duty_type: str, validators: List[str], data):
+        self._pending_duties[(epoch, duty_type)] = (','.join(validators), json.dumps(data))
+
+    def _take_pending(self) -> Tuple[Dict, Dict, Dict, Dict]:
+        """Swap out the pending buffers (call from the event loop thread)"""
+        batch = (self._pending_slots, self._pending_arrivals, self._pending_rewards, self._pending_duties)
+        self._pending_slots = {}
+        self._pending_arrivals = {}
+        self._pending_rewards = {}
+        self._pending_duties = {}
+        return batch
+
+    def flush(self):
+        """Write all pending rows in a single transaction"""
+        self._write(self._take_pending())
+
+    def _write(self, batch: Tuple[Dict, Dict, Dict, Dict]):
+        slots, arrivals, rewards, duties = batch
+        if not self._conn or not (slots or arrivals or rewards or duties):
+            return
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO slots (slot, status, summary) VALUES (?, ?, ?)",
+                [(slot, status, summary) for slot, (status, summary) in slots.items()]
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO arrivals (slot, arrival_ms) VALUES (?, ?)",
+                list(arrivals.items())
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO validator_rewards (epoch, validators, data) VALUES (?, ?, ?)",
+                [(epoch, validators, data) for (epoch, validators), data in rewards.items()]
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO duties (epoch, duty_type, validators, data) VALUES (?, ?, ?, ?)",
+                [(epoch, duty_type, validators, data) for (epoch, duty_type), (validators, data) in duties.items()]
+            )
+
+    def prune(self, min_slot: int, min_rewards_epoch: int, min_duties_epoch: int):
+        """Delete rows that fall outside the retention window"""
+        if not self._conn:
+            return
+
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM slots WHERE slot < ?", (min_slot,))
+            self._conn.execute("DELETE FROM arrivals WHERE slot < ?", (min_slot,))
+            self._conn.execute("DELETE FROM validator_rewards WHERE epoch < ?", (min_rewards_epoch,))
+            self._conn.execute("DELETE FROM duties WHERE epoch < ?", (min_duties_epoch,))
+
+    async def run_flusher(self, retention: Callable[[], Tuple[int, int, int]], interval: float = 12,
+                          prune_every: int = 32):
+        """Periodically flush pending writes from a worker thread.
+
+        Every `prune_every` flushes, rows older than the (min_slot,
+        min_rewards_epoch, min_duties_epoch) returned by `retention` are deleted.
+        """
+        loop = asyncio.get_running_loop()
+        flushes = 0
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await loop.run_in_executor(None, self._write, self._take_pending())
+                flushes += 1
+                if flushes % prune_every == 0:
+                    await loop.run_in_executor(None, self.prune, *retention())
+            except Exception as e:
+                logging.error(f"Error flushing slot store: {e}")
+
+    def load_slots(self, min_slot: int) -> Dict[int, Dict]:
+        """Load slot summaries from `min_slot` onwards as slot -> {status, summary}"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT slot, status, summary FROM slots WHERE slot >= ?", (min_slot,)
+            ).fetchall()
+        return {
+            slot: {'status': status, 'summary': json.loads(summary) if summary else None}
+            for slot, status, summary in rows
+        }
+
+    def load_arrivals(self, min_slot: int) -> List[Tuple[int, int]]:
+        """Load (slot, arrival_ms) pairs from `min_slot` onwards, oldest first"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT slot, arrival_ms FROM arrivals WHERE slot >= ? ORDER BY slot", (min_slot,)
+            ).fetchall()
+
+    def load_rewards(self, min_epoch: int, validators: List[str]) -> Dict[int, List[Dict]]:
+        """Load rewards that were fetched for the same validator set"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT epoch, data FROM validator_rewards WHERE epoch >= ? AND validators = ?",
+                (min_epoch, ','.join(validators))
+            ).fetchall()
+        return {epoch: json.loads(data) for epoch, data in rows}
+
+    def load_duties(self, min_epoch: int, duty_type: str, validators: List[str]) -> Dict[int, object]:
+        """Load duties of one type that were fetched for the same validator set"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT epoch, data FROM duties WHERE epoch >= ? AND duty_type = ? AND validators = ?",
+                (min_epoch, duty_type, ','.join(validators))
+            ).fetchall()
+        return {epoch: json.loads(data) for epoch, data in rows}
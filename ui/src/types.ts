@@ -50,8 +50,22 @@ export interface ArrivalTime {
   arrival_time: number;
 }
 
+export interface ArrivalTimeStats {
+  count: number;
+  from_slot?: number;
+  to_slot?: number;
+  mean?: number;
+  p50?: number;
+  p90?: number;
+  p99?: number;
+  late_threshold?: number;
+  late_count?: number;
+  late_rate?: number;
+}
+
 export interface ArrivalTimesResponse {
   arrival_times: ArrivalTime[];
+  stats: ArrivalTimeStats;
   seconds_per_slot: number;
 }
 
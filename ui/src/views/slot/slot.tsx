@@ -17,6 +17,18 @@ interface BidStats {
   trend_pct?: number;
 }
 
+interface RelayBid {
+  relay_name: string;
+  value?: string;
+  block_hash?: string;
+  bid_count: number;
+}
+
+interface BidCurvePoint {
+  time: number;
+  value: number;
+}
+
 interface SlotData {
   slot?: number;
   entity?: string;
@@ -24,6 +36,9 @@ interface SlotData {
     value?: string;
     relay_name?: string;
   };
+  winning_relays?: string[];
+  relays?: RelayBid[];
+  bid_curve?: BidCurvePoint[];
   slot_history?: HistoryEntry[];
   bid_stats?: BidStats;
   error?: string;
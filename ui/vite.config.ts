@@ -9,7 +9,7 @@ export default defineConfig({
   assetsInclude: ['**/*.ttf'],
   build: {
     cssCodeSplit: false,
-    minify: false,
+    minify: true,
     target: 'esnext',
     rollupOptions: {
       output: {